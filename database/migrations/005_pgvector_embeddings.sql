@@ -0,0 +1,14 @@
+-- Store code embeddings as pgvector vectors
+-- This migration moves embedding_vector from REAL[] to vector(384) and adds an ANN index
+
+-- Enable pgvector extension
+CREATE EXTENSION IF NOT EXISTS vector;
+
+-- Convert existing embeddings (dimension matches all-MiniLM-L6-v2)
+ALTER TABLE code_embeddings
+    ALTER COLUMN embedding_vector TYPE vector(384)
+    USING embedding_vector::vector(384);
+
+-- HNSW index for cosine-distance nearest neighbour search
+CREATE INDEX IF NOT EXISTS idx_code_embeddings_vector_hnsw
+    ON code_embeddings USING hnsw (embedding_vector vector_cosine_ops);
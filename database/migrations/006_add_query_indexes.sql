@@ -0,0 +1,15 @@
+-- Composite and partial indexes for hot query predicates
+-- This migration adds (owner, time) indexes used by listing and analytics queries
+
+-- Per-user / per-project time-ordered listings
+CREATE INDEX IF NOT EXISTS idx_api_logs_user_created ON api_logs(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_cost_tracking_user_created ON cost_tracking(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_code_analyses_project_created ON code_analyses(project_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_project_analytics_project_date ON project_analytics(project_id, date DESC);
+-- user_analytics(user_id, date) is already covered by its UNIQUE constraint
+
+-- Only active projects are listed
+CREATE INDEX IF NOT EXISTS idx_projects_user_active ON projects(user_id) WHERE is_active;
+
+-- BRIN index for time-range scans on the append-only API log
+CREATE INDEX IF NOT EXISTS idx_api_logs_created_at_brin ON api_logs USING BRIN (created_at);
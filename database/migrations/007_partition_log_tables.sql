@@ -0,0 +1,138 @@
+-- Monthly range partitioning for append-only log tables
+-- This migration recreates api_logs and cost_tracking as PARTITION BY RANGE (created_at).
+-- New partitions are created ahead of time by the create_monthly_partitions() job;
+-- old months can be removed cheaply with ALTER TABLE ... DETACH PARTITION + DROP TABLE.
+
+BEGIN;
+
+-- Create monthly partitions of a table from start_month through months_ahead months from now
+CREATE OR REPLACE FUNCTION create_monthly_partitions(
+    parent_table TEXT,
+    start_month DATE DEFAULT DATE_TRUNC('month', NOW())::DATE,
+    months_ahead INTEGER DEFAULT 2
+)
+RETURNS VOID AS $$
+DECLARE
+    month_start DATE := DATE_TRUNC('month', start_month)::DATE;
+    last_month DATE := (DATE_TRUNC('month', NOW()) + make_interval(months => months_ahead))::DATE;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent_table || '_' || to_char(month_start, '"y"YYYY"m"MM'),
+            parent_table,
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Views bind to the old tables, so drop and recreate them around the swap
+DROP VIEW IF EXISTS user_cost_summary;
+
+-- API usage logs
+ALTER TABLE api_logs RENAME TO api_logs_unpartitioned;
+
+CREATE TABLE api_logs (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    user_id UUID REFERENCES users(id) ON DELETE SET NULL,
+    endpoint VARCHAR(100) NOT NULL,
+    method VARCHAR(10) NOT NULL,
+    status_code INTEGER NOT NULL,
+    response_time_ms INTEGER,
+    request_size_bytes INTEGER,
+    response_size_bytes INTEGER,
+    ip_address INET,
+    user_agent TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    -- The partition key must be part of the primary key
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+SELECT create_monthly_partitions(
+    'api_logs',
+    COALESCE((SELECT MIN(created_at) FROM api_logs_unpartitioned)::DATE, NOW()::DATE)
+);
+
+INSERT INTO api_logs
+SELECT id, user_id, endpoint, method, status_code, response_time_ms, request_size_bytes,
+       response_size_bytes, ip_address, user_agent, COALESCE(created_at, NOW())
+FROM api_logs_unpartitioned;
+
+DROP TABLE api_logs_unpartitioned;
+
+-- Indexes on the parent are created on every partition, including future ones
+CREATE INDEX idx_api_logs_user_id ON api_logs(user_id);
+CREATE INDEX idx_api_logs_endpoint ON api_logs(endpoint);
+CREATE INDEX idx_api_logs_user_created ON api_logs(user_id, created_at DESC);
+CREATE INDEX idx_api_logs_created_at_brin ON api_logs USING BRIN (created_at);
+
+-- Cost tracking
+ALTER TABLE cost_tracking RENAME TO cost_tracking_unpartitioned;
+
+CREATE TABLE cost_tracking (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
+    operation_type VARCHAR(50) NOT NULL,
+    tokens_used INTEGER,
+    cost_amount DECIMAL(10,4) NOT NULL,
+    endpoint VARCHAR(100),
+    request_data JSONB,
+    model_used VARCHAR(100),
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    total_tokens INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+SELECT create_monthly_partitions(
+    'cost_tracking',
+    COALESCE((SELECT MIN(created_at) FROM cost_tracking_unpartitioned)::DATE, NOW()::DATE)
+);
+
+-- Copy history without firing the analytics trigger a second time
+INSERT INTO cost_tracking
+SELECT id, user_id, project_id, operation_type, tokens_used, cost_amount, endpoint, request_data,
+       model_used, prompt_tokens, completion_tokens, total_tokens, COALESCE(created_at, NOW())
+FROM cost_tracking_unpartitioned;
+
+-- Keep the row-level security policy if the full schema installed one
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_policies
+        WHERE tablename = 'cost_tracking_unpartitioned' AND policyname = 'cost_tracking_isolation'
+    ) THEN
+        ALTER TABLE cost_tracking ENABLE ROW LEVEL SECURITY;
+        CREATE POLICY cost_tracking_isolation ON cost_tracking FOR ALL TO authenticated
+            USING (user_id = current_setting('app.current_user_id')::uuid);
+    END IF;
+END $$;
+
+DROP TABLE cost_tracking_unpartitioned;
+
+CREATE INDEX idx_cost_tracking_user_id ON cost_tracking(user_id);
+CREATE INDEX idx_cost_tracking_user_created ON cost_tracking(user_id, created_at DESC);
+CREATE INDEX idx_cost_tracking_created_at_brin ON cost_tracking USING BRIN (created_at);
+
+CREATE TRIGGER update_analytics_on_cost_tracking
+    AFTER INSERT ON cost_tracking
+    FOR EACH ROW EXECUTE FUNCTION update_daily_analytics();
+
+CREATE VIEW user_cost_summary AS
+SELECT
+    u.id as user_id,
+    u.email,
+    u.name,
+    COALESCE(SUM(ct.cost_amount), 0) as total_cost,
+    COUNT(ct.id) as total_requests,
+    MAX(ct.created_at) as last_request
+FROM users u
+LEFT JOIN cost_tracking ct ON u.id = ct.user_id
+GROUP BY u.id, u.email, u.name;
+
+COMMIT;
@@ -0,0 +1,52 @@
+-- DEFAULT partitions for the monthly-partitioned log tables
+-- Without them, api_logs and cost_tracking writes fail once the current month has no
+-- partition (e.g. a long-running process that never re-ran partition creation).
+-- create_monthly_partitions() now creates the DEFAULT partition and moves its rows into
+-- a month's partition when that partition is created later.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION create_monthly_partitions(
+    parent_table TEXT,
+    start_month DATE DEFAULT DATE_TRUNC('month', NOW())::DATE,
+    months_ahead INTEGER DEFAULT 2
+)
+RETURNS VOID AS $$
+DECLARE
+    month_start DATE := DATE_TRUNC('month', start_month)::DATE;
+    last_month DATE := (DATE_TRUNC('month', NOW()) + make_interval(months => months_ahead))::DATE;
+    default_partition TEXT := parent_table || '_default';
+    month_partition TEXT;
+BEGIN
+    -- Catches rows for months without a partition, so writes never fail
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT', default_partition, parent_table);
+
+    WHILE month_start <= last_month LOOP
+        month_partition := parent_table || '_' || to_char(month_start, '"y"YYYY"m"MM');
+        IF to_regclass(month_partition) IS NULL THEN
+            -- Move the month's rows out of the default partition, then attach
+            EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', month_partition, parent_table);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM %I WHERE created_at >= %L AND created_at < %L RETURNING *) INSERT INTO %I SELECT * FROM moved',
+                default_partition,
+                month_start,
+                (month_start + INTERVAL '1 month')::DATE,
+                month_partition
+            );
+            EXECUTE format(
+                'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                parent_table,
+                month_partition,
+                month_start,
+                (month_start + INTERVAL '1 month')::DATE
+            );
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_monthly_partitions('api_logs');
+SELECT create_monthly_partitions('cost_tracking');
+
+COMMIT;
@@ -4,6 +4,9 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Enable pgvector extension for embedding similarity search
+CREATE EXTENSION IF NOT EXISTS vector;
+
 -- Users table
 CREATE TABLE users (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -97,7 +100,7 @@ CREATE TABLE integrations (
 
 -- Cost tracking
 CREATE TABLE cost_tracking (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
     operation_type VARCHAR(50) NOT NULL, -- analyze, refactor, test, generate
@@ -105,21 +108,22 @@ CREATE TABLE cost_tracking (
     cost_amount DECIMAL(10,4) NOT NULL,
     endpoint VARCHAR(100),
     request_data JSONB,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
 
 -- Vector embeddings for code similarity
 CREATE TABLE code_embeddings (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     code_analysis_id UUID REFERENCES code_analyses(id) ON DELETE CASCADE,
-    embedding_vector REAL[] NOT NULL,
+    embedding_vector vector(384) NOT NULL,
     embedding_model VARCHAR(100) NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
 -- API usage logs
 CREATE TABLE api_logs (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     user_id UUID REFERENCES users(id) ON DELETE SET NULL,
     endpoint VARCHAR(100) NOT NULL,
     method VARCHAR(10) NOT NULL,
@@ -129,8 +133,54 @@ CREATE TABLE api_logs (
     response_size_bytes INTEGER,
     ip_address INET,
     user_agent TEXT,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Monthly partitions for the append-only log tables; run periodically to stay ahead
+-- (old months are removed with ALTER TABLE ... DETACH PARTITION + DROP TABLE)
+CREATE OR REPLACE FUNCTION create_monthly_partitions(
+    parent_table TEXT,
+    start_month DATE DEFAULT DATE_TRUNC('month', NOW())::DATE,
+    months_ahead INTEGER DEFAULT 2
+)
+RETURNS VOID AS $$
+DECLARE
+    month_start DATE := DATE_TRUNC('month', start_month)::DATE;
+    last_month DATE := (DATE_TRUNC('month', NOW()) + make_interval(months => months_ahead))::DATE;
+    default_partition TEXT := parent_table || '_default';
+    month_partition TEXT;
+BEGIN
+    -- Catches rows for months without a partition, so writes never fail
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT', default_partition, parent_table);
+
+    WHILE month_start <= last_month LOOP
+        month_partition := parent_table || '_' || to_char(month_start, '"y"YYYY"m"MM');
+        IF to_regclass(month_partition) IS NULL THEN
+            -- Move the month's rows out of the default partition, then attach
+            EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', month_partition, parent_table);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM %I WHERE created_at >= %L AND created_at < %L RETURNING *) INSERT INTO %I SELECT * FROM moved',
+                default_partition,
+                month_start,
+                (month_start + INTERVAL '1 month')::DATE,
+                month_partition
+            );
+            EXECUTE format(
+                'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                parent_table,
+                month_partition,
+                month_start,
+                (month_start + INTERVAL '1 month')::DATE
+            );
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_monthly_partitions('api_logs');
+SELECT create_monthly_partitions('cost_tracking');
 
 -- Indexes for performance
 CREATE INDEX idx_users_email ON users(email);
@@ -144,9 +194,16 @@ CREATE INDEX idx_test_generations_code_analysis_id ON test_generations(code_anal
 CREATE INDEX idx_integrations_user_id ON integrations(user_id);
 CREATE INDEX idx_integrations_service_name ON integrations(service_name);
 CREATE INDEX idx_cost_tracking_user_id ON cost_tracking(user_id);
-CREATE INDEX idx_cost_tracking_created_at ON cost_tracking(created_at);
+CREATE INDEX idx_cost_tracking_created_at_brin ON cost_tracking USING BRIN (created_at);
 CREATE INDEX idx_api_logs_user_id ON api_logs(user_id);
-CREATE INDEX idx_api_logs_created_at ON api_logs(created_at);
+CREATE INDEX idx_api_logs_user_created ON api_logs(user_id, created_at DESC);
+CREATE INDEX idx_api_logs_created_at_brin ON api_logs USING BRIN (created_at);
+CREATE INDEX idx_cost_tracking_user_created ON cost_tracking(user_id, created_at DESC);
+CREATE INDEX idx_code_analyses_project_created ON code_analyses(project_id, created_at DESC);
+CREATE INDEX idx_projects_user_active ON projects(user_id) WHERE is_active;
+
+-- Vector similarity index (approximate nearest neighbour, cosine distance)
+CREATE INDEX idx_code_embeddings_vector_hnsw ON code_embeddings USING hnsw (embedding_vector vector_cosine_ops);
 
 -- Full-text search indexes
 CREATE INDEX idx_code_analyses_analysis_data_gin ON code_analyses USING GIN (analysis_data);
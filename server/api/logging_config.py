@@ -0,0 +1,87 @@
+"""
+Logging configuration.
+Records are handed to a queue and formatted/written by a background listener thread,
+so request handlers never block on log I/O or traceback formatting.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from datetime import datetime, timezone
+import logging
+import os
+import queue
+
+import orjson
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "text" or "json" (one JSON object per line, including `extra` fields)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# Write to this file instead of stderr when set
+LOG_FILE = os.getenv("LOG_FILE")
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(data, default=str).decode()
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves all formatting, tracebacks included, to the listener thread.
+
+    The stock handler formats the message in the calling thread so records can be
+    pickled; the queue here is in-process, so the record is passed through as is.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging():
+    """Route root logging through a queue drained by a background listener thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.FileHandler(LOG_FILE) if LOG_FILE else logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [DeferredQueueHandler(log_queue)]
+    root.setLevel(LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Flush queued records, stop the listener thread and log directly again.
+
+    Anything logged after this (later shutdown hooks, atexit) would otherwise be
+    queued with nothing left to drain it.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().handlers = list(_listener.handlers)
+    _listener = None
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import os
 from dotenv import load_dotenv
 try:
@@ -17,6 +17,7 @@ from api.middleware.auth import AuthMiddleware
 from api.middleware.policy import PolicyMiddleware
 from api.middleware.cost_tracker import CostTrackerMiddleware
 from api.middleware.health_monitor import health_monitoring_middleware
+from api.logging_config import setup_logging, stop_logging
 from api.middleware.timeout import TimeoutMiddleware
 from api.middleware.error_handlers import (
     api_exception_handler,
@@ -33,58 +34,94 @@ from api.middleware.exceptions import (
     CircuitBreakerException,
     ServiceUnavailableException
 )
-from services.llm.openai_client import OpenAIClient
-from services.indexer.vector_store import VectorStore
-from database.schema import init_db
+from services.llm.openai_client import get_openai_client, close_openai_client
+from services.indexer.vector_store import vector_store
+from services.integrations.github import close_github_session
+from services.integrations.github_extended import close_github_extended
+from services.action_bus import event_batcher
+from services.batching import api_log_writer
+from database.schema import init_db, log_partition_maintainer
 from fastapi import Request
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # Load environment variables
 load_dotenv()
 
+# Non-blocking logging (records are formatted and written on a background thread)
+setup_logging()
+
+# Default trace sample rate for routes without a specific rule
+SENTRY_TRACES_SAMPLE_RATE = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.1"))
+
+def sentry_traces_sampler(sampling_context):
+    """Sample traces per route: skip health probes and list polling, favor action lookups."""
+    parent_sampled = sampling_context.get("parent_sampled")
+    if parent_sampled is not None:
+        return float(parent_sampled)  # Respect upstream decision
+
+    scope = sampling_context.get("asgi_scope") or {}
+    path = scope.get("path", "")
+    method = scope.get("method", "GET")
+
+    if path.startswith("/api/health") or path == "/metrics":
+        return 0.0
+    if method == "GET" and path in ("/api/workflow/actions", "/api/workflow/events"):
+        return 0.0  # High-volume dashboard polling
+    if path.startswith("/api/workflow/actions/"):
+        return 0.5
+    return SENTRY_TRACES_SAMPLE_RATE
+
+def init_sentry():
+    """Initialize Sentry once per process (no-op if a client is already active)."""
+    if SENTRY_AVAILABLE and sentry_sdk.get_client().is_active():
+        return
+
+    sentry_dsn = os.getenv("SENTRY_DSN")
+    if sentry_dsn and SENTRY_AVAILABLE:
+        try:
+            # Note: User Reporting DSNs (sntryu_*) are not directly supported by sentry-sdk
+            # They require a standard DSN format (https://key@host/project)
+            # For now, we'll store the User Reporting DSN but notify that standard DSN is needed
+            if sentry_dsn.startswith("sntryu_"):
+                print("⚠️  User Reporting DSN detected - this format is not directly supported")
+                print("   User Reporting DSNs are for frontend user feedback, not backend error tracking")
+                print("   Please use a standard Sentry DSN (https://...) for backend error tracking")
+                print("   Current DSN will be stored but Sentry will not be initialized")
+                print("   To enable Sentry, add a standard DSN from: Settings → Projects → Client Keys (DSN)")
+            elif sentry_dsn.startswith("https://"):
+                # Standard DSN format - initialize Sentry
+                sentry_sdk.init(
+                    dsn=sentry_dsn,
+                    integrations=[
+                        FastApiIntegration(),
+                        SqlalchemyIntegration(),
+                    ],
+                    # Route-aware performance monitoring
+                    traces_sampler=sentry_traces_sampler,
+                    # Profiling adds per-request CPU; off unless explicitly enabled
+                    profiles_sample_rate=float(os.getenv("SENTRY_PROFILES_SAMPLE_RATE", "0.0")),
+                    environment=os.getenv("ENVIRONMENT", "development"),
+                    # Attach stack traces
+                    attach_stacktrace=True,
+                    # Release tracking
+                    release=os.getenv("SENTRY_RELEASE", None),
+                )
+                print("✅ Sentry initialized for error tracking")
+                print(f"   Environment: {os.getenv('ENVIRONMENT', 'development')}")
+            else:
+                print(f"⚠️  Invalid Sentry DSN format: {sentry_dsn}")
+                print("   Expected format: https://key@host/project or sntryu_* (for frontend)")
+        except Exception as e:
+            print(f"⚠️  Sentry initialization failed: {e}")
+            print("   Error tracking will continue without Sentry")
+    elif sentry_dsn and not SENTRY_AVAILABLE:
+        print("⚠️  Sentry DSN provided but sentry-sdk not installed - skipping Sentry initialization")
+        print("   Install with: pip install sentry-sdk[fastapi]")
+    else:
+        print("ℹ️  No Sentry DSN provided - error tracking disabled")
+
 # Initialize Sentry if DSN is provided
-sentry_dsn = os.getenv("SENTRY_DSN")
-if sentry_dsn and SENTRY_AVAILABLE:
-    try:
-        # Note: User Reporting DSNs (sntryu_*) are not directly supported by sentry-sdk
-        # They require a standard DSN format (https://key@host/project)
-        # For now, we'll store the User Reporting DSN but notify that standard DSN is needed
-        if sentry_dsn.startswith("sntryu_"):
-            print("⚠️  User Reporting DSN detected - this format is not directly supported")
-            print("   User Reporting DSNs are for frontend user feedback, not backend error tracking")
-            print("   Please use a standard Sentry DSN (https://...) for backend error tracking")
-            print("   Current DSN will be stored but Sentry will not be initialized")
-            print("   To enable Sentry, add a standard DSN from: Settings → Projects → Client Keys (DSN)")
-        elif sentry_dsn.startswith("https://"):
-            # Standard DSN format - initialize Sentry
-            sentry_sdk.init(
-                dsn=sentry_dsn,
-                integrations=[
-                    FastApiIntegration(),
-                    SqlalchemyIntegration(),
-                ],
-                traces_sample_rate=1.0,
-                environment=os.getenv("ENVIRONMENT", "development"),
-                # Enable performance monitoring
-                enable_tracing=True,
-                # Attach stack traces
-                attach_stacktrace=True,
-                # Release tracking
-                release=os.getenv("SENTRY_RELEASE", None),
-            )
-            print("✅ Sentry initialized for error tracking")
-            print(f"   Environment: {os.getenv('ENVIRONMENT', 'development')}")
-        else:
-            print(f"⚠️  Invalid Sentry DSN format: {sentry_dsn}")
-            print("   Expected format: https://key@host/project or sntryu_* (for frontend)")
-    except Exception as e:
-        print(f"⚠️  Sentry initialization failed: {e}")
-        print("   Error tracking will continue without Sentry")
-elif sentry_dsn and not SENTRY_AVAILABLE:
-    print("⚠️  Sentry DSN provided but sentry-sdk not installed - skipping Sentry initialization")
-    print("   Install with: pip install sentry-sdk[fastapi]")
-else:
-    print("ℹ️  No Sentry DSN provided - error tracking disabled")
+init_sentry()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -92,7 +129,8 @@ app = FastAPI(
     description="AI-powered coding assistant API",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -223,13 +261,16 @@ async def startup_event():
         # Initialize database (optional - won't fail if not available)
         await init_db()
         print("✅ Database initialized")
+        # Bulk-load API logs via COPY instead of per-request INSERTs
+        await api_log_writer.start()
+        # Keep monthly log partitions ahead of time without relying on Celery beat
+        await log_partition_maintainer.start()
     except Exception as e:
         print(f"⚠️  Database not available: {e}")
         print("   Server will run without database in mock mode")
     
     try:
         # Initialize vector store
-        vector_store = VectorStore()
         await vector_store.initialize()
         print("✅ Vector store initialized")
     except Exception as e:
@@ -237,18 +278,29 @@ async def startup_event():
     
     try:
         # Initialize OpenAI client
-        openai_client = OpenAIClient()
+        openai_client = get_openai_client()
         await openai_client.initialize()
         print("✅ OpenAI client initialized")
     except Exception as e:
         print(f"⚠️  OpenAI client not available: {e}")
     
+    # Start batched event emission
+    await event_batcher.start()
+
     print("🚀 Coding Agent API started successfully!")
 
 # Cleanup on shutdown
 @app.on_event("shutdown")
 async def shutdown_event():
     print("Coding Agent API shutting down...")
+    await event_batcher.stop()
+    await api_log_writer.stop()
+    await log_partition_maintainer.stop()
+    await close_github_extended()
+    await close_github_session()
+    await close_openai_client()
+    await vector_store.close()
+    stop_logging()
 
 if __name__ == "__main__":
     import uvicorn
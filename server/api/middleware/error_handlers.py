@@ -241,9 +241,10 @@ async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPE
 
 async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """Handle unexpected exceptions."""
-    logger.critical(
-        f"Unexpected error: {str(exc)}",
-        exc_info=True,
+    logger.exception(
+        "Unexpected error: %s",
+        exc,
+        exc_info=exc,
         extra={
             "path": str(request.url),
             "method": request.method,
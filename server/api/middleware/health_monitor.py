@@ -5,11 +5,13 @@ Tracks request-level health metrics and integrates with the health check service
 
 import time
 import logging
+import ipaddress
 from typing import Callable
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 
 from services.health import health_service
+from services.batching import api_log_writer
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +97,17 @@ class HealthMonitoringMiddleware:
             "recent_response_times_count": len(self.response_times)
         }
 
+def _content_length(headers) -> int | None:
+    value = headers.get("content-length")
+    return int(value) if value and value.isdigit() else None
+
+def _client_ip(request: Request) -> str | None:
+    # A malformed INET value would fail the whole COPY batch
+    try:
+        return str(ipaddress.ip_address(request.client.host)) if request.client else None
+    except ValueError:
+        return None
+
 async def health_monitoring_middleware(request: Request, call_next) -> Response:
     """
     FastAPI middleware for health monitoring.
@@ -115,6 +128,18 @@ async def health_monitoring_middleware(request: Request, call_next) -> Response:
         path = request.url.path
         method = request.method
 
+        # Queue an API log row; written in bulk by the background COPY writer
+        api_log_writer.add(
+            endpoint=path[:100],
+            method=method,
+            status_code=response.status_code,
+            response_time_ms=int(response_time * 1000),
+            request_size_bytes=_content_length(request.headers),
+            response_size_bytes=_content_length(response.headers),
+            ip_address=_client_ip(request),
+            user_agent=request.headers.get("user-agent")
+        )
+
         # Track in health service if it's a health endpoint
         if path.startswith("/api/health"):
             logger.debug(f"Health endpoint {method} {path} responded in {response_time:.3f}s with status {response.status_code}")
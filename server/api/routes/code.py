@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Any
 import asyncio
+import json
 import logging
 
-from services.llm.openai_client import OpenAIClient
+from services.llm.openai_client import get_openai_client
 from services.indexer.ast_parser import ASTParser
 from services.indexer.embeddings import EmbeddingService
 from api.middleware.auth import get_current_user
@@ -40,6 +42,38 @@ class CodeExplanationResponse(BaseModel):
     data_flow: str
     dependencies: List[str]
 
+def build_analysis_prompt(request: CodeAnalysisRequest) -> str:
+    """Build the AI analysis prompt for a code analysis request."""
+    return f"""
+                Analyze the following code and provide:
+                1. Code quality assessment
+                2. Complexity analysis
+                3. Performance suggestions
+                4. Security considerations
+                5. Best practices recommendations
+
+                Code:
+                ```{request.language}
+                {request.code}
+                ```
+
+                Context: {request.context or "No additional context provided"}
+                """
+
+def validate_analysis_request(request: CodeAnalysisRequest):
+    """Reject empty or oversized code."""
+    if not request.code or not request.code.strip():
+        raise ValidationException(
+            message="Code content cannot be empty",
+            details={"field": "code"}
+        )
+
+    if len(request.code) > 100000:  # 100KB limit
+        raise ValidationException(
+            message="Code content exceeds maximum size limit",
+            details={"max_size": "100KB", "actual_size": f"{len(request.code)} chars"}
+        )
+
 @router.post("/code", response_model=CodeAnalysisResponse)
 async def analyze_code(
     request: CodeAnalysisRequest,
@@ -48,21 +82,11 @@ async def analyze_code(
     """Analyze code for quality, complexity, and suggestions."""
     try:
         # Validate input
-        if not request.code or not request.code.strip():
-            raise ValidationException(
-                message="Code content cannot be empty",
-                details={"field": "code"}
-            )
-
-        if len(request.code) > 100000:  # 100KB limit
-            raise ValidationException(
-                message="Code content exceeds maximum size limit",
-                details={"max_size": "100KB", "actual_size": f"{len(request.code)} chars"}
-            )
+        validate_analysis_request(request)
 
         # Initialize services
         try:
-            openai_client = OpenAIClient()
+            openai_client = get_openai_client()
             ast_parser = ASTParser()
             embedding_service = EmbeddingService()
         except Exception as e:
@@ -101,26 +125,13 @@ async def analyze_code(
             logger.warning(f"Embedding generation failed: {str(e)}")
             # Continue without embeddings
 
+        # Render the prompt once; retries resend the same text
+        analysis_prompt = build_analysis_prompt(request)
+
         # Analyze with OpenAI with retry logic
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                analysis_prompt = f"""
-                Analyze the following code and provide:
-                1. Code quality assessment
-                2. Complexity analysis
-                3. Performance suggestions
-                4. Security considerations
-                5. Best practices recommendations
-
-                Code:
-                ```{request.language}
-                {request.code}
-                ```
-
-                Context: {request.context or "No additional context provided"}
-                """
-
                 analysis_result = await asyncio.wait_for(
                     openai_client.analyze_code(analysis_prompt),
                     timeout=30.0  # 30 second timeout for AI analysis
@@ -176,6 +187,44 @@ async def analyze_code(
             details={"error_type": type(e).__name__}
         )
 
+@router.post("/code/stream")
+async def analyze_code_stream(
+    request: CodeAnalysisRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream the AI analysis as server-sent events while it is generated.
+
+    Each text delta is sent as a ``data:`` frame holding ``{"content": ...}``.
+    The stream ends with an ``event: done`` frame carrying token usage, or an
+    ``event: error`` frame if generation fails part-way.
+    """
+    validate_analysis_request(request)
+    openai_client = get_openai_client()
+    analysis_prompt = build_analysis_prompt(request)
+
+    async def stream():
+        usage: dict = {}
+        try:
+            async for content in openai_client.analyze_code_stream(analysis_prompt, usage):
+                yield sse_frame({"content": content})
+        except Exception as e:
+            # Headers are already sent, so report the failure as its own event
+            logger.error(f"Streaming analysis failed: {str(e)}")
+            yield sse_frame({"message": str(e)}, event="error")
+            return
+        yield sse_frame({"usage": usage}, event="done")
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def sse_frame(data: dict, event: Optional[str] = None) -> str:
+    """Encode one server-sent event; JSON keeps newlines in the text from splitting the frame."""
+    frame = f"event: {event}\n" if event else ""
+    return f"{frame}data: {json.dumps(data)}\n\n"
+
 @router.post("/explain", response_model=CodeExplanationResponse)
 async def explain_code(
     request: CodeExplanationRequest,
@@ -206,7 +255,7 @@ async def explain_code(
 
         # Initialize OpenAI client
         try:
-            openai_client = OpenAIClient()
+            openai_client = get_openai_client()
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI client: {str(e)}")
             raise ServiceUnavailableException(
@@ -214,11 +263,8 @@ async def explain_code(
                 details={"service": "openai_client"}
             )
 
-        # Generate explanation with timeout and retry logic
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                explanation_prompt = f"""
+        # Render the prompt once; retries resend the same text
+        explanation_prompt = f"""
                 Explain the following code in detail:
                 1. What the code does
                 2. Key components and their roles
@@ -234,6 +280,10 @@ async def explain_code(
                 ```
                 """
 
+        # Generate explanation with timeout and retry logic
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
                 explanation_result = await asyncio.wait_for(
                     openai_client.explain_code(explanation_prompt),
                     timeout=25.0  # 25 second timeout for explanation
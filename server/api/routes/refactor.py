@@ -4,7 +4,7 @@ from typing import List, Optional
 import asyncio
 import logging
 
-from services.llm.openai_client import OpenAIClient
+from services.llm.openai_client import OpenAIClient, get_openai_client
 from services.generator.refactor import RefactorService
 from api.middleware.auth import get_current_user
 from api.middleware.exceptions import (
@@ -76,7 +76,7 @@ async def suggest_refactor(
         # Initialize services
         try:
             refactor_service = RefactorService()
-            openai_client = OpenAIClient()
+            openai_client = get_openai_client()
         except Exception as e:
             logger.error(f"Failed to initialize refactoring services: {str(e)}")
             raise ServiceUnavailableException(
@@ -84,11 +84,8 @@ async def suggest_refactor(
                 details={"service": "refactor_services"}
             )
 
-        # Analyze code for refactoring opportunities with timeout and retry
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                analysis_prompt = f"""
+        # Render the prompt once; retries resend the same text
+        analysis_prompt = f"""
                 Analyze the following code for refactoring opportunities:
 
                 Code:
@@ -109,6 +106,10 @@ async def suggest_refactor(
                 7. Line number if applicable
                 """
 
+        # Analyze code for refactoring opportunities with timeout and retry
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
                 analysis_result = await asyncio.wait_for(
                     openai_client.analyze_code(analysis_prompt),
                     timeout=30.0  # 30 second timeout for analysis
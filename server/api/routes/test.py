@@ -4,7 +4,7 @@ from typing import List, Optional
 import asyncio
 import logging
 
-from services.llm.openai_client import OpenAIClient
+from services.llm.openai_client import get_openai_client
 from services.generator.test_gen import TestGenerator
 from api.middleware.auth import get_current_user
 from api.middleware.exceptions import (
@@ -82,7 +82,7 @@ async def generate_test(
         # Initialize services
         try:
             test_generator = TestGenerator()
-            openai_client = OpenAIClient()
+            openai_client = get_openai_client()
         except Exception as e:
             logger.error(f"Failed to initialize test generation services: {str(e)}")
             raise ServiceUnavailableException(
@@ -99,11 +99,8 @@ async def generate_test(
                 logger.warning(f"Framework detection failed: {str(e)}, using default")
                 framework = "jest"  # Default fallback
 
-        # Generate test cases with timeout and retry
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                test_prompt = f"""
+        # Render the prompt once; retries resend the same text
+        test_prompt = f"""
                 Generate comprehensive tests for the following code:
 
                 Code:
@@ -132,6 +129,10 @@ async def generate_test(
                 - Security aspects
                 """
 
+        # Generate test cases with timeout and retry
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
                 test_result = await asyncio.wait_for(
                     openai_client.generate_tests(test_prompt),
                     timeout=45.0  # 45 second timeout for test generation
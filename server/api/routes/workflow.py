@@ -3,14 +3,17 @@ Workflow API routes for Unified DevOS
 Flow Board, Work Items, Action Bus integration
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from typing import List, Optional
-from datetime import datetime
-from pydantic import BaseModel
+from datetime import datetime, timezone
+from pydantic import BaseModel, ConfigDict
+import asyncio
 import logging
+import os
 
-from services.action_bus import action_bus, EventType, ActionStatus
-from services.integrations.github_extended import GitHubExtendedIntegration
+from services.action_bus import action_bus, event_batcher, EventType, ActionStatus
+from services.cache import StaleWhileRevalidateCache
+from services.integrations.github_extended import GitHubExtendedIntegration, get_github_extended
 from api.middleware.exceptions import (
     ServiceUnavailableException,
     ValidationException,
@@ -21,7 +24,13 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Event type lookup tables, built once instead of per request
+_EVENT_TYPE_MAP = {e.name.lower(): e for e in EventType}
+_VALID_EVENT_TYPES = [e.value for e in EventType]
+
 class WorkItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     type: str  # spec, issue, pr, commit, test, deployment, doc
     title: str
@@ -31,6 +40,8 @@ class WorkItem(BaseModel):
     metadata: dict = {}
 
 class FlowStatus(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     repo: str
     issues_open: int
     prs_open: int
@@ -39,18 +50,58 @@ class FlowStatus(BaseModel):
     timestamp: datetime
 
 class ActionRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
     action_type: str
     payload: dict
     idempotency_key: Optional[str] = None
 
-# Initialize GitHub integration
-github = GitHubExtendedIntegration()
+class ActionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    type: str
+    status: ActionStatus
+    payload: dict
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+    retry_count: int = 0
+
+class ActionResult(BaseModel):
+    success: bool
+    action: ActionOut
+
+class EventOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    type: EventType
+    source: str
+    payload: dict
+    timestamp: datetime
+    action_ids: Optional[List[str]] = None
+
+# Flow status cache: fresh for 60s, served stale (with background refresh) up to 10min
+flow_status_cache = StaleWhileRevalidateCache(
+    ttl=float(os.getenv("FLOW_STATUS_CACHE_TTL", "60.0")),
+    stale_ttl=float(os.getenv("FLOW_STATUS_CACHE_STALE_TTL", "600.0")),
+    should_cache=lambda status: "error" not in status,
+    # Keys come from the URL path, so bound how many repos are remembered
+    maxsize=int(os.getenv("FLOW_STATUS_CACHE_MAXSIZE", "1024"))
+)
+
+def get_request_time() -> datetime:
+    """Wall-clock UTC time, evaluated once per request."""
+    return datetime.now(timezone.utc)
 
 @router.get("/workitems", response_model=List[WorkItem])
 async def list_work_items(
     type: Optional[str] = Query(None, description="Filter by type"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    limit: int = Query(100, ge=1, le=1000)
+    limit: int = Query(100, ge=1, le=1000),
+    now: datetime = Depends(get_request_time)
 ):
     """List work items with optional filters."""
     # Placeholder - would query from database
@@ -60,264 +111,221 @@ async def list_work_items(
             type="spec",
             title="Add user authentication",
             status="approved",
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            created_at=now,
+            updated_at=now,
             metadata={"owner": "team", "priority": "high"}
         )
     ]
 
 @router.get("/flow/{owner}/{repo}", response_model=FlowStatus)
-async def get_flow_status(owner: str, repo: str):
+async def get_flow_status(
+    owner: str,
+    repo: str,
+    github: GitHubExtendedIntegration = Depends(get_github_extended)
+):
     """Get unified flow status for a repository."""
-    try:
-        # Validate input
-        if not owner or not owner.strip():
-            raise ValidationException(
-                message="Repository owner cannot be empty",
-                details={"field": "owner"}
-            )
-
-        if not repo or not repo.strip():
-            raise ValidationException(
-                message="Repository name cannot be empty",
-                details={"field": "repo"}
-            )
+    # Validate input
+    if not owner or not owner.strip():
+        raise ValidationException(
+            message="Repository owner cannot be empty",
+            details={"field": "owner"}
+        )
 
-        # Get flow status with timeout protection
-        try:
-            status = await asyncio.wait_for(
-                github.get_flow_status(owner, repo),
-                timeout=30.0  # 30 second timeout for GitHub API
-            )
-        except asyncio.TimeoutError:
-            logger.error(f"GitHub flow status request timed out for {owner}/{repo}")
-            raise TimeoutException(
-                message="Repository status request timed out",
-                details={"operation": "get_flow_status", "repo": f"{owner}/{repo}"}
-            )
+    if not repo or not repo.strip():
+        raise ValidationException(
+            message="Repository name cannot be empty",
+            details={"field": "repo"}
+        )
 
-        if "error" in status:
-            raise ServiceUnavailableException(
-                message="Failed to retrieve repository status",
-                details={"repo": f"{owner}/{repo}", "error": status["error"]}
+    # Get flow status with timeout protection
+    try:
+        async with asyncio.timeout(30.0):  # 30 second timeout for GitHub API
+            status = await flow_status_cache.get(
+                (owner, repo),
+                lambda: github.get_flow_status(owner, repo)
             )
+    except asyncio.TimeoutError:
+        logger.error("GitHub flow status request timed out for %s/%s", owner, repo, extra={"owner": owner, "repo": repo})
+        raise TimeoutException(
+            message="Repository status request timed out",
+            details={"operation": "get_flow_status", "repo": f"{owner}/{repo}"}
+        )
 
-        return FlowStatus(**status)
-
-    except ValidationException:
-        raise  # Re-raise validation errors
-    except TimeoutException:
-        raise  # Re-raise timeout errors
-    except ServiceUnavailableException:
-        raise  # Re-raise service unavailable errors
-    except Exception as e:
-        logger.critical(f"Unexpected error getting flow status for {owner}/{repo}: {str(e)}", exc_info=True)
+    if "error" in status:
         raise ServiceUnavailableException(
-            message="An unexpected error occurred while retrieving repository status",
-            details={"error_type": type(e).__name__, "repo": f"{owner}/{repo}"}
+            message="Failed to retrieve repository status",
+            details={"repo": f"{owner}/{repo}", "error": status["error"]}
         )
 
-@router.get("/actions")
+    return FlowStatus(**status)
+
+@router.get("/actions", response_model=List[ActionOut])
 async def list_actions(status: Optional[str] = None, limit: int = 100):
     """List recent actions."""
-    actions = action_bus.list_actions(
+    # Serve the bus's cached JSON bytes instead of re-validating every action
+    content = action_bus.list_actions_json(
         status=ActionStatus[status.upper()] if status else None,
         limit=limit
     )
-    return [action.__dict__ for action in actions]
+    return Response(content=content, media_type="application/json")
 
-@router.post("/actions")
+@router.post("/actions", response_model=ActionResult)
 async def execute_action(request: ActionRequest):
     """Execute an action via Action Bus."""
-    try:
-        # Validate input
-        if not request.action_type or not request.action_type.strip():
-            raise ValidationException(
-                message="Action type cannot be empty",
-                details={"field": "action_type"}
-            )
+    # Validate input
+    if not request.action_type or not request.action_type.strip():
+        raise ValidationException(
+            message="Action type cannot be empty",
+            details={"field": "action_type"}
+        )
 
-        if not request.payload:
-            raise ValidationException(
-                message="Action payload cannot be empty",
-                details={"field": "payload"}
-            )
+    if not request.payload:
+        raise ValidationException(
+            message="Action payload cannot be empty",
+            details={"field": "payload"}
+        )
 
-        # Execute action with timeout protection
-        try:
-            action = await asyncio.wait_for(
-                action_bus.execute_action(
-                    request.action_type,
-                    request.payload,
-                    request.idempotency_key
-                ),
-                timeout=60.0  # 60 second timeout for action execution
-            )
-        except asyncio.TimeoutError:
-            logger.error(f"Action execution timed out: {request.action_type}")
-            raise TimeoutException(
-                message="Action execution timed out",
-                details={"operation": "execute_action", "action_type": request.action_type}
+    # Execute action with timeout protection
+    try:
+        async with asyncio.timeout(60.0):  # 60 second timeout for action execution
+            action = await action_bus.execute_action(
+                request.action_type,
+                request.payload,
+                request.idempotency_key
             )
-
-        return {
-            "success": True,
-            "action": action.__dict__
-        }
-
-    except ValidationException:
-        raise  # Re-raise validation errors
-    except TimeoutException:
-        raise  # Re-raise timeout errors
-    except Exception as e:
-        logger.critical(f"Unexpected error executing action {request.action_type}: {str(e)}", exc_info=True)
-        raise ServiceUnavailableException(
-            message="An unexpected error occurred while executing the action",
-            details={"error_type": type(e).__name__, "action_type": request.action_type}
+    except asyncio.TimeoutError:
+        logger.error("Action execution timed out: %s", request.action_type, extra={"action_type": request.action_type})
+        raise TimeoutException(
+            message="Action execution timed out",
+            details={"operation": "execute_action", "action_type": request.action_type}
         )
 
-@router.get("/actions/{action_id}")
+    return {
+        "success": True,
+        "action": action
+    }
+
+@router.get("/actions/{action_id}", response_model=ActionOut)
 async def get_action(action_id: str):
     """Get a specific action by ID."""
     action = action_bus.get_action(action_id)
     if not action:
         raise HTTPException(status_code=404, detail="Action not found")
-    return action.__dict__
+    return action
 
-@router.get("/events")
+@router.get("/events", response_model=List[EventOut])
 async def list_events(limit: int = 100):
     """List recent events."""
-    events = action_bus.get_events(limit=limit)
-    return [event.__dict__ for event in events]
+    return Response(content=action_bus.get_events_json(limit=limit), media_type="application/json")
 
 @router.post("/events")
 async def emit_event(event_type: str, source: str, payload: dict):
     """Emit a new event."""
-    try:
-        # Validate input
-        if not event_type or not event_type.strip():
-            raise ValidationException(
-                message="Event type cannot be empty",
-                details={"field": "event_type"}
-            )
-
-        if not source or not source.strip():
-            raise ValidationException(
-                message="Event source cannot be empty",
-                details={"field": "source"}
-            )
+    # Validate input
+    if not event_type or not event_type.strip():
+        raise ValidationException(
+            message="Event type cannot be empty",
+            details={"field": "event_type"}
+        )
 
-        if not payload:
-            raise ValidationException(
-                message="Event payload cannot be empty",
-                details={"field": "payload"}
-            )
+    if not source or not source.strip():
+        raise ValidationException(
+            message="Event source cannot be empty",
+            details={"field": "source"}
+        )
 
-        # Validate event type
-        try:
-            event_type_enum = EventType[event_type.lower()]
-        except KeyError:
-            valid_event_types = [e.value for e in EventType]
-            raise ValidationException(
-                message=f"Unknown event type: {event_type}",
-                details={"valid_types": valid_event_types, "provided": event_type}
-            )
+    if not payload:
+        raise ValidationException(
+            message="Event payload cannot be empty",
+            details={"field": "payload"}
+        )
 
-        # Emit event with timeout protection
-        try:
-            event_id = await asyncio.wait_for(
-                action_bus.emit_event(event_type_enum, source, payload),
-                timeout=30.0  # 30 second timeout for event emission
-            )
-        except asyncio.TimeoutError:
-            logger.error(f"Event emission timed out: {event_type}")
-            raise TimeoutException(
-                message="Event emission timed out",
-                details={"operation": "emit_event", "event_type": event_type}
-            )
+    # Validate event type
+    event_type_enum = _EVENT_TYPE_MAP.get(event_type.lower())
+    if event_type_enum is None:
+        raise ValidationException(
+            message=f"Unknown event type: {event_type}",
+            details={"valid_types": _VALID_EVENT_TYPES, "provided": event_type}
+        )
 
-        return {
-            "success": True,
-            "event_id": event_id
-        }
-
-    except ValidationException:
-        raise  # Re-raise validation errors
-    except TimeoutException:
-        raise  # Re-raise timeout errors
-    except Exception as e:
-        logger.critical(f"Unexpected error emitting event {event_type}: {str(e)}", exc_info=True)
+    # Queue event for batched emission (bounded queue provides backpressure)
+    try:
+        async with asyncio.timeout(30.0):  # 30 second timeout for event emission
+            event_id = await event_batcher.submit(event_type_enum, source, payload)
+    except asyncio.TimeoutError:
+        logger.error("Event emission timed out: %s", event_type, extra={"event_type": event_type})
+        raise TimeoutException(
+            message="Event emission timed out",
+            details={"operation": "emit_event", "event_type": event_type}
+        )
+    except asyncio.QueueFull:
+        logger.warning("Event queue full, rejecting event: %s", event_type, extra={"event_type": event_type})
         raise ServiceUnavailableException(
-            message="An unexpected error occurred while emitting the event",
-            details={"error_type": type(e).__name__, "event_type": event_type}
+            message="Event queue is full, retry later",
+            details={"operation": "emit_event", "event_type": event_type}
         )
 
+    return {
+        "success": True,
+        "event_id": event_id
+    }
+
 @router.get("/specs")
 async def list_specs():
     """List all specs."""
     # Placeholder
     return []
 
-@router.post("/specs")
-async def create_spec(title: str, description: str):
-    """Create a new spec."""
-    try:
-        # Validate input
-        if not title or not title.strip():
-            raise ValidationException(
-                message="Spec title cannot be empty",
-                details={"field": "title"}
-            )
+@router.post("/specs", response_model=ActionResult)
+async def create_spec(
+    title: str,
+    description: str,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """Create a new spec. Retries with the same Idempotency-Key return the original action."""
+    # Validate input
+    if not title or not title.strip():
+        raise ValidationException(
+            message="Spec title cannot be empty",
+            details={"field": "title"}
+        )
 
-        if not description or not description.strip():
-            raise ValidationException(
-                message="Spec description cannot be empty",
-                details={"field": "description"}
-            )
+    if not description or not description.strip():
+        raise ValidationException(
+            message="Spec description cannot be empty",
+            details={"field": "description"}
+        )
 
-        # Validate title length
-        if len(title) > 200:
-            raise ValidationException(
-                message="Spec title exceeds maximum length",
-                details={"max_length": 200, "actual_length": len(title)}
-            )
+    # Validate title length
+    if len(title) > 200:
+        raise ValidationException(
+            message="Spec title exceeds maximum length",
+            details={"max_length": 200, "actual_length": len(title)}
+        )
 
-        if len(description) > 5000:
-            raise ValidationException(
-                message="Spec description exceeds maximum length",
-                details={"max_length": 5000, "actual_length": len(description)}
-            )
+    if len(description) > 5000:
+        raise ValidationException(
+            message="Spec description exceeds maximum length",
+            details={"max_length": 5000, "actual_length": len(description)}
+        )
 
-        # Execute action with timeout protection
-        try:
-            action = await asyncio.wait_for(
-                action_bus.execute_action(
-                    "create_spec",
-                    {"title": title, "description": description},
-                    f"spec_{title}_{datetime.now().timestamp()}"
-                ),
-                timeout=30.0  # 30 second timeout for spec creation
-            )
-        except asyncio.TimeoutError:
-            logger.error(f"Spec creation timed out: {title}")
-            raise TimeoutException(
-                message="Spec creation timed out",
-                details={"operation": "create_spec", "title": title}
+    # Execute action with timeout protection
+    try:
+        async with asyncio.timeout(30.0):  # 30 second timeout for spec creation
+            action = await action_bus.execute_action(
+                "create_spec",
+                {"title": title, "description": description},
+                f"spec_{idempotency_key}" if idempotency_key else None
             )
-
-        return {
-            "success": True,
-            "action": action.__dict__
-        }
-
-    except ValidationException:
-        raise  # Re-raise validation errors
-    except TimeoutException:
-        raise  # Re-raise timeout errors
-    except Exception as e:
-        logger.critical(f"Unexpected error creating spec '{title}': {str(e)}", exc_info=True)
-        raise ServiceUnavailableException(
-            message="An unexpected error occurred while creating the spec",
-            details={"error_type": type(e).__name__, "title": title}
+    except asyncio.TimeoutError:
+        logger.error("Spec creation timed out: %s", title, extra={"title": title})
+        raise TimeoutException(
+            message="Spec creation timed out",
+            details={"operation": "create_spec", "title": title}
         )
 
+    return {
+        "success": True,
+        "action": action
+    }
+
@@ -5,14 +5,28 @@ if __name__ == "__main__":
     import uvicorn
     import sys
     import os
-    
+
     # Add the server directory to the Python path
     sys.path.insert(0, os.path.dirname(__file__))
-    
-    uvicorn.run(
-        "api.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
-    )
 
+    if os.getenv("ENVIRONMENT", "development").lower() == "production":
+        # Production: uvloop + httptools, no autoreload. Extra workers are opt-in
+        # via WEB_CONCURRENCY because the Action Bus, idempotency keys, caches and
+        # file-backed vector store are not shared between processes yet.
+        uvicorn.run(
+            "api.main:app",
+            host="0.0.0.0",
+            port=int(os.getenv("PORT", "8000")),
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            loop="uvloop",
+            http="httptools",
+            log_level="info",
+            proxy_headers=True
+        )
+    else:
+        uvicorn.run(
+            "api.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True
+        )
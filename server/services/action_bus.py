@@ -7,7 +7,15 @@ from typing import Dict, Any, List, Callable, Optional
 from datetime import datetime
 from enum import Enum
 import asyncio
-from dataclasses import dataclass, asdict
+import logging
+import os
+from dataclasses import dataclass
+import orjson
+
+from .cache import TTLCache
+from .batching import STOP, collect_batch, drain_queue
+
+logger = logging.getLogger(__name__)
 
 class ActionStatus(Enum):
     PENDING = "pending"
@@ -28,7 +36,7 @@ class EventType(Enum):
     TEST_PASSED = "test_passed"
     TEST_FAILED = "test_failed"
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     id: str
     type: str
@@ -40,7 +48,7 @@ class Action:
     error: Optional[str] = None
     retry_count: int = 0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Event:
     id: str
     type: EventType
@@ -57,29 +65,38 @@ class ActionBus:
         self.events: List[Event] = []
         self.handlers: Dict[EventType, List[Callable]] = {}
         self.idempotency_keys: Dict[str, str] = {}
+        # Short-lived cache for list queries; the version is bumped on every write
+        self._version = 0
+        self._list_cache = TTLCache(maxsize=64, ttl=1.0)
         
-    async def emit_event(self, event_type: EventType, source: str, payload: Dict[str, Any]) -> str:
-        """Emit an event and trigger registered handlers."""
-        event_id = f"evt_{datetime.now().timestamp()}"
-        event = Event(
-            id=event_id,
+    def create_event(self, event_type: EventType, source: str, payload: Dict[str, Any]) -> Event:
+        """Build an event without emitting it."""
+        return Event(
+            id=f"evt_{datetime.now().timestamp()}",
             type=event_type,
             source=source,
             payload=payload,
             timestamp=datetime.now()
         )
-        
-        self.events.append(event)
+
+    async def emit_event(self, event_type: EventType, source: str, payload: Dict[str, Any]) -> str:
+        """Emit an event and trigger registered handlers."""
+        event = self.create_event(event_type, source, payload)
+        await self.emit_events_bulk([event])
+        return event.id
+
+    async def emit_events_bulk(self, events: List[Event]):
+        """Store a batch of events and trigger registered handlers for each."""
+        self.events.extend(events)
+        self._version += 1
         
         # Trigger handlers
-        if event_type in self.handlers:
-            for handler in self.handlers[event_type]:
+        for event in events:
+            for handler in self.handlers.get(event.type, ()):
                 try:
                     await handler(event)
                 except Exception as e:
                     print(f"Error in event handler: {e}")
-        
-        return event_id
     
     async def register_handler(self, event_type: EventType, handler: Callable):
         """Register an event handler."""
@@ -112,6 +129,7 @@ class ActionBus:
         # Mark as running
         action.status = ActionStatus.RUNNING
         action.started_at = datetime.now()
+        self._version += 1
         
         try:
             # Execute action based on type
@@ -126,6 +144,7 @@ class ActionBus:
             action.completed_at = datetime.now()
             action.error = str(e)
         
+        self._version += 1
         return action
     
     async def _execute_action_internal(self, action_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -179,16 +198,131 @@ class ActionBus:
         return self.actions.get(action_id)
     
     def list_actions(self, status: Optional[ActionStatus] = None, limit: int = 100) -> List[Action]:
-        """List actions, optionally filtered by status."""
+        """List actions, optionally filtered by status (cached until the next write)."""
+        key = ("actions", status, limit, self._version)
+        cached = self._list_cache.get(key)
+        if cached is not None:
+            return cached
+
         actions = list(self.actions.values())
         if status:
             actions = [a for a in actions if a.status == status]
-        return sorted(actions, key=lambda x: x.created_at, reverse=True)[:limit]
+        result = sorted(actions, key=lambda x: x.created_at, reverse=True)[:limit]
+        self._list_cache.set(key, result)
+        return result
     
+    def list_actions_json(self, status: Optional[ActionStatus] = None, limit: int = 100) -> bytes:
+        """list_actions() pre-serialized to JSON bytes (cached until the next write)."""
+        key = ("actions_json", status, limit, self._version)
+        cached = self._list_cache.get(key)
+        if cached is None:
+            cached = orjson.dumps(self.list_actions(status=status, limit=limit))
+            self._list_cache.set(key, cached)
+        return cached
+
     def get_events(self, limit: int = 100) -> List[Event]:
-        """Get recent events."""
-        return sorted(self.events, key=lambda x: x.timestamp, reverse=True)[:limit]
+        """Get recent events (cached until the next write)."""
+        key = ("events", limit, self._version)
+        cached = self._list_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = sorted(self.events, key=lambda x: x.timestamp, reverse=True)[:limit]
+        self._list_cache.set(key, result)
+        return result
+
+    def get_events_json(self, limit: int = 100) -> bytes:
+        """get_events() pre-serialized to JSON bytes (cached until the next write)."""
+        key = ("events_json", limit, self._version)
+        cached = self._list_cache.get(key)
+        if cached is None:
+            cached = orjson.dumps(self.get_events(limit=limit))
+            self._list_cache.set(key, cached)
+        return cached
+
+class EventBatcher:
+    """Buffers emitted events in a bounded queue and flushes them to the bus in batches."""
+
+    def __init__(
+        self,
+        bus: ActionBus,
+        max_batch_size: int = 500,
+        flush_interval: float = 0.05,
+        max_queue_size: int = 10_000,
+        put_timeout: float = 0.1
+    ):
+        self.bus = bus
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.put_timeout = put_timeout
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the background flush loop on the running event loop."""
+        if self.running:
+            return
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and emit anything still queued."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            # Let the loop finish the batch it is holding instead of cancelling it
+            await self.queue.put(STOP)
+        await self._task
+        self._task = None
+
+        remaining = drain_queue(self.queue)
+        if remaining:
+            await self.bus.emit_events_bulk(remaining)
+
+    async def submit(self, event_type: EventType, source: str, payload: Dict[str, Any]) -> str:
+        """Queue an event for emission and return its ID.
+
+        Raises asyncio.QueueFull if the queue stays full for put_timeout seconds.
+        Falls back to direct emission when the batcher isn't running.
+        """
+        event = self.bus.create_event(event_type, source, payload)
+        if not self.running:
+            await self.bus.emit_events_bulk([event])
+            return event.id
+
+        try:
+            await asyncio.wait_for(self.queue.put(event), timeout=self.put_timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.QueueFull()
+        return event.id
+
+    async def _run(self):
+        while True:
+            batch = await collect_batch(self.queue, self.max_batch_size, self.flush_interval)
+            stopping = batch[-1] is STOP
+            if stopping:
+                batch.pop()
+            if batch:
+                try:
+                    await self.bus.emit_events_bulk(batch)
+                except Exception as e:
+                    logger.error(f"Failed to flush {len(batch)} events: {str(e)}")
+            if stopping:
+                return
 
 # Global action bus instance
 action_bus = ActionBus()
 
+# Global event batcher, started/stopped with the application
+event_batcher = EventBatcher(
+    action_bus,
+    max_batch_size=int(os.getenv("EVENT_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("EVENT_FLUSH_INTERVAL", "0.05")),
+    max_queue_size=int(os.getenv("EVENT_QUEUE_SIZE", "10000"))
+)
+
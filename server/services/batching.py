@@ -0,0 +1,162 @@
+"""
+Batching helpers for high-volume, append-only writes.
+Buffers records in a bounded queue and flushes them in bulk.
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+import asyncio
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop() so the flush loop writes its current batch and exits
+STOP = object()
+
+
+async def collect_batch(queue: asyncio.Queue, max_batch_size: int, flush_interval: float) -> List[Any]:
+    """Wait for one item, then collect more until the batch is full or flush_interval elapses.
+
+    Collection ends early at STOP, which is kept as the last item of the batch.
+    """
+    loop = asyncio.get_running_loop()
+    batch = [await queue.get()]
+    deadline = loop.time() + flush_interval
+
+    while len(batch) < max_batch_size and batch[-1] is not STOP:
+        try:
+            batch.append(queue.get_nowait())
+            continue
+        except asyncio.QueueEmpty:
+            pass
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+        except asyncio.TimeoutError:
+            break
+
+    return batch
+
+
+def drain_queue(queue: asyncio.Queue) -> List[Any]:
+    """Take everything currently in the queue without waiting."""
+    items = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        if item is not STOP:
+            items.append(item)
+    return items
+
+
+class BatchWriter:
+    """Buffers rows for an append-only table and bulk-loads them with COPY.
+
+    Rows are queued without blocking the request path and written by a background
+    task every flush_interval seconds or max_batch_size rows, whichever comes first.
+    If the queue is full, rows are dropped rather than slowing down requests.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        columns: Sequence[str],
+        max_batch_size: int = 500,
+        flush_interval: float = 0.1,
+        max_queue_size: int = 50_000
+    ):
+        self.table = table
+        self.columns: Tuple[str, ...] = ("id", *columns, "created_at")
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the background flush loop on the running event loop."""
+        if self.running:
+            return
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write anything still queued."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            # Let the loop finish the batch it is holding instead of cancelling it
+            await self.queue.put(STOP)
+        await self._task
+        self._task = None
+
+        remaining = drain_queue(self.queue)
+        if remaining:
+            await self._flush(remaining)
+
+    def add(self, **values: Any) -> bool:
+        """Queue a row. Returns False if the writer isn't running or the row was dropped."""
+        if not self.running:
+            return False
+        record = (
+            values.pop("id", None) or uuid.uuid4(),
+            *(values.get(column) for column in self.columns[1:-1]),
+            values.get("created_at") or datetime.now(timezone.utc)
+        )
+        try:
+            self.queue.put_nowait(record)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"{self.table} write queue full, dropped {self.dropped} rows so far")
+            return False
+
+    async def _run(self):
+        while True:
+            batch = await collect_batch(self.queue, self.max_batch_size, self.flush_interval)
+            stopping = batch[-1] is STOP
+            if stopping:
+                batch.pop()
+            if batch:
+                await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, records: List[tuple]):
+        try:
+            await self._copy(records)
+        except Exception as e:
+            logger.error(f"Failed to write {len(records)} rows to {self.table}: {str(e)}")
+
+    async def _copy(self, records: List[tuple]):
+        """COPY records into the table over a pooled asyncpg connection."""
+        from database.schema import engine
+
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                self.table,
+                records=records,
+                columns=list(self.columns)
+            )
+
+
+# Per-request API log writer, started with the application when the database is available
+api_log_writer = BatchWriter(
+    "api_logs",
+    columns=(
+        "user_id", "endpoint", "method", "status_code", "response_time_ms",
+        "request_size_bytes", "response_size_bytes", "ip_address", "user_agent"
+    ),
+    max_batch_size=int(os.getenv("API_LOG_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("API_LOG_FLUSH_INTERVAL", "0.1"))
+)
@@ -0,0 +1,143 @@
+"""
+In-process caching helpers for hot, I/O-bound API paths.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import logging
+import math
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of -log(1 - u) for u = random() < 1 (u <= 1 - 2**-53)
+_MAX_XFETCH_FACTOR = 53 * math.log(2)
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire ttl seconds after being stored."""
+
+    def __init__(self, maxsize: int = 64, ttl: float = 1.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, value), ordered from least to most recently used
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live value for key, or default if missing/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class StaleWhileRevalidateCache:
+    """TTL cache that serves stale entries while refreshing them in the background.
+
+    - Fresh entries (younger than ``ttl``) are returned without calling the loader.
+    - Stale entries (younger than ``stale_ttl``) are returned immediately and a
+      background refresh is scheduled.
+    - Missing or expired entries are loaded inline.
+
+    Concurrent loads for the same key are coalesced onto a single in-flight task,
+    so a burst of requests results in one upstream call. Entries are also refreshed
+    early with XFetch-style probability (``beta``) to avoid synchronized expiry.
+    At most ``maxsize`` entries are kept, evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        stale_ttl: float = 600.0,
+        beta: float = 1.0,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        rng: Optional[random.Random] = None,
+        maxsize: int = 1024
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.beta = beta
+        # Pass a seeded Random for reproducible early refreshes
+        self._rng = rng or random.Random()
+        self.should_cache = should_cache or (lambda value: True)
+        # key -> (stored_at, load_duration, value), ordered from least to most recently used
+        self._entries: "OrderedDict[Hashable, Tuple[float, float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Get the cached value for key, calling loader when it must be (re)loaded."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, duration, value = entry
+            age = time.monotonic() - stored_at
+            if age < self.stale_ttl:
+                self._entries.move_to_end(key)
+            if age < self.ttl and not self._should_refresh_early(age, duration):
+                return value
+            if age < self.stale_ttl:
+                self._refresh(key, loader)
+                return value
+            # Too old to serve; don't keep it around for keys that are never asked for again
+            del self._entries[key]
+
+        # Shield the shared task so one caller's cancellation doesn't abort the others
+        return await asyncio.shield(self._refresh(key, loader))
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop a single key, or every entry when key is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _should_refresh_early(self, age: float, duration: float) -> bool:
+        """XFetch probabilistic early expiration."""
+        if self.beta <= 0 or duration <= 0:
+            return False
+        gap = duration * self.beta
+        # -log(1 - u) can't exceed _MAX_XFETCH_FACTOR, so far from expiry no draw can trigger
+        if self.ttl - age > gap * _MAX_XFETCH_FACTOR:
+            return False
+        return age - gap * math.log(1.0 - self._rng.random()) >= self.ttl
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start (or join) the in-flight load for key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_load_done(key, t))
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.monotonic()
+        value = await loader()
+        now = time.monotonic()
+        if self.should_cache(value):
+            self._entries[key] = (now, now - start, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def _on_load_done(self, key: Hashable, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Cache refresh failed for {key}: {task.exception()}")
@@ -4,9 +4,10 @@ Monitors system health, circuit breakers, timeouts, and service availability.
 """
 
 import asyncio
+import os
 import time
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
@@ -17,9 +18,9 @@ except ImportError:
     PSUTIL_AVAILABLE = False
 
 # Import existing services
-from .llm.openai_client import OpenAIClient
+from .llm.openai_client import get_openai_client
 from .integrations.github import GitHubIntegration
-from .integrations.github_extended import GitHubExtendedIntegration
+from .integrations.github_extended import get_github_extended
 from .action_bus import ActionBus
 
 logger = logging.getLogger(__name__)
@@ -58,32 +59,70 @@ class HealthCheckService:
     def __init__(self):
         self.start_time = time.time()
         self.services = {
-            "openai": OpenAIClient(),
+            "openai": get_openai_client(),
             "github": GitHubIntegration(),
-            "github_extended": GitHubExtendedIntegration(),
+            "github_extended": get_github_extended(),
             "action_bus": ActionBus()
         }
         self.timeout_events: List[Dict[str, Any]] = []
         self.last_health_check = None
         self.health_check_interval = 30  # seconds
+        # Probes and dashboards poll /api/health concurrently; serve a recent report instead of re-checking
+        self.health_cache_ttl = float(os.getenv("HEALTH_CACHE_TTL", "1.0"))
+        # Keyed by report: "overall" (SystemHealth) and "services" (List[ServiceHealth])
+        self._health_cache: Dict[str, Tuple[float, Any]] = {}
+        self._health_locks = {"overall": asyncio.Lock(), "services": asyncio.Lock()}
+
+    def _cached_report(self, key: str) -> Optional[Any]:
+        entry = self._health_cache.get(key)
+        if entry is None:
+            return None
+        checked_at, report = entry
+        return report if time.monotonic() - checked_at < self.health_cache_ttl else None
+
+    async def _get_report(self, key: str, check) -> Any:
+        """Return a cached report younger than health_cache_ttl, or run check() once for all waiters."""
+        report = self._cached_report(key)
+        if report is not None:
+            return report
+
+        async with self._health_locks[key]:
+            # Another request may have refreshed the report while we waited
+            report = self._cached_report(key)
+            if report is None:
+                report = await check()
+                self._health_cache[key] = (time.monotonic(), report)
+            return report
 
     async def check_overall_health(self) -> SystemHealth:
+        """Get overall system health, reusing a report younger than health_cache_ttl."""
+        health = await self._get_report("overall", self._run_health_check)
+        if health.services and self._cached_report("services") is None:
+            # The overall check already probed every service; let /health/services reuse it
+            self._health_cache["services"] = self._health_cache["overall"][0], health.services
+        return health
+
+    async def _check_all_services(self) -> List[ServiceHealth]:
+        """Probe all services concurrently."""
+        return list(await asyncio.gather(*(
+            self._check_service_health(service_name, service)
+            for service_name, service in self.services.items()
+        )))
+
+    async def _run_health_check(self) -> SystemHealth:
         """Perform comprehensive health check of all system components."""
         start_time = time.time()
         timestamp = datetime.now()
 
         try:
             # Check individual services
-            service_healths = []
-            for service_name, service in self.services.items():
-                service_health = await self._check_service_health(service_name, service)
-                service_healths.append(service_health)
+            service_healths = await self._check_all_services()
 
             # Get circuit breaker states
             circuit_breakers = await self._get_circuit_breaker_states()
 
-            # Get system resources
-            system_resources = self._get_system_resources()
+            # Get system resources (psutil samples CPU for a second, so keep it off the event loop)
+            system_resources = await asyncio.to_thread(self._get_system_resources)
 
             # Determine overall status
             overall_status = self._determine_overall_status(service_healths)
@@ -148,12 +187,15 @@ class HealthCheckService:
         }
 
     async def check_services_health(self) -> Dict[str, Any]:
-        """Check individual service health."""
+        """Check individual service health.
+
+        Only probes the services (no system resource sampling), and reuses the
+        service results of a fresh overall report when there is one.
+        """
         service_statuses = {}
 
-        for service_name, service in self.services.items():
-            health = await self._check_service_health(service_name, service)
-            service_statuses[service_name] = {
+        for health in await self._get_report("services", self._check_all_services):
+            service_statuses[health.name] = {
                 "status": health.status,
                 "response_time": health.response_time,
                 "last_check": health.last_check.isoformat() if health.last_check else None,
@@ -258,17 +300,19 @@ class HealthCheckService:
             return {"error": "psutil not available - system resources monitoring disabled"}
 
         try:
+            memory = psutil.virtual_memory()
+            disk = psutil.disk_usage('/')
             return {
                 "cpu_percent": psutil.cpu_percent(interval=1),
                 "memory": {
-                    "total": psutil.virtual_memory().total,
-                    "available": psutil.virtual_memory().available,
-                    "percent": psutil.virtual_memory().percent
+                    "total": memory.total,
+                    "available": memory.available,
+                    "percent": memory.percent
                 },
                 "disk": {
-                    "total": psutil.disk_usage('/').total,
-                    "free": psutil.disk_usage('/').free,
-                    "percent": psutil.disk_usage('/').percent
+                    "total": disk.total,
+                    "free": disk.free,
+                    "percent": disk.percent
                 }
             }
         except Exception as e:
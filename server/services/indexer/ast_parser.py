@@ -3,6 +3,11 @@ import re
 from typing import Dict, Any, List, Optional
 import asyncio
 
+# Node types that add a decision point; matched with one set lookup per node
+_DECISION_NODES = frozenset({ast.If, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler, ast.BoolOp})
+_NESTING_NODES = frozenset({ast.If, ast.While, ast.For, ast.AsyncFor, ast.With, ast.AsyncWith})
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
 class ASTParser:
     def __init__(self):
         self.supported_languages = ["python", "javascript", "typescript"]
@@ -38,7 +43,7 @@ class ASTParser:
             complexity = 0
             
             for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
+                if isinstance(node, _FUNCTION_NODES):
                     func_complexity = self.calculate_cyclomatic_complexity(node)
                     complexity += func_complexity
                     
@@ -54,7 +59,7 @@ class ASTParser:
                     classes.append({
                         "name": node.name,
                         "line_number": node.lineno,
-                        "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
+                        "methods": [n.name for n in node.body if isinstance(n, _FUNCTION_NODES)],
                         "docstring": ast.get_docstring(node)
                     })
                 
@@ -166,17 +171,12 @@ class ASTParser:
 
     def calculate_cyclomatic_complexity(self, node: ast.AST) -> int:
         """Calculate cyclomatic complexity for a function."""
-        complexity = 1  # Base complexity
-        
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
-        
-        return complexity
+        # Base complexity of 1, plus one per branch (or per extra operand of a boolean chain)
+        return 1 + sum(
+            len(child.values) - 1 if type(child) is ast.BoolOp else 1
+            for child in ast.walk(node)
+            if type(child) in _DECISION_NODES
+        )
 
     def calculate_max_nesting_depth(self, tree: ast.AST) -> int:
         """Calculate maximum nesting depth."""
@@ -187,10 +187,7 @@ class ASTParser:
             max_depth = max(max_depth, depth)
             
             for child in ast.iter_child_nodes(node):
-                if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor, ast.With, ast.AsyncWith)):
-                    visit_node(child, depth + 1)
-                else:
-                    visit_node(child, depth)
+                visit_node(child, depth + 1 if type(child) in _NESTING_NODES else depth)
         
         visit_node(tree, 0)
         return max_depth
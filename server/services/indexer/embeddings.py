@@ -4,6 +4,8 @@ import asyncio
 from sentence_transformers import SentenceTransformer
 import hashlib
 
+from .hashing import content_hash
+
 class EmbeddingService:
     def __init__(self):
         self.model_name = "all-MiniLM-L6-v2"  # Lightweight model
@@ -66,14 +68,14 @@ class EmbeddingService:
             return {
                 "embedding": embedding,
                 "metadata": metadata or {},
-                "text_hash": hashlib.md5(code.encode()).hexdigest()
+                "text_hash": content_hash(code)
             }
         except Exception as e:
             print(f"Code embedding generation failed: {e}")
             return {
                 "embedding": self.generate_hash_embedding(code),
                 "metadata": metadata or {},
-                "text_hash": hashlib.md5(code.encode()).hexdigest()
+                "text_hash": content_hash(code)
             }
 
     async def find_similar_code(self, query_embedding: List[float], code_embeddings: List[Dict[str, Any]], top_k: int = 5) -> List[Dict[str, Any]]:
@@ -0,0 +1,19 @@
+"""
+Non-cryptographic content hashing for code IDs and text hashes.
+"""
+
+import hashlib
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+def content_hash(text: str) -> str:
+    """128-bit hex digest of text (xxh3 when installed, otherwise BLAKE2b)."""
+    data = text.encode()
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
@@ -1,17 +1,32 @@
 import os
 import json
 import numpy as np
+import orjson
 from typing import List, Dict, Any, Optional
 import asyncio
 from datetime import datetime
 
+from .hashing import content_hash
+
 class VectorStore:
     def __init__(self):
         self.store_file = "data/vector_store.json"
+        # Writes mark the store dirty; a background task persists it every flush_interval seconds
+        self.flush_interval = float(os.getenv("VECTOR_STORE_FLUSH_INTERVAL", "5.0"))
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
         self.embeddings = []
         self.metadata = []
+        # code ID -> position in embeddings/metadata, so lookups don't scan the store
+        self._positions: Dict[str, int] = {}
         self.embedding_service = None
 
+    def _reindex(self):
+        """Rebuild the ID index after the lists are replaced or shifted."""
+        self._positions = {}
+        for i, metadata in enumerate(self.metadata):
+            self._positions.setdefault(metadata["id"], i)
+
     async def initialize(self):
         """Initialize the vector store."""
         try:
@@ -25,6 +40,9 @@ class VectorStore:
             from .embeddings import EmbeddingService
             self.embedding_service = EmbeddingService()
             await self.embedding_service.initialize()
+
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_loop())
             
             print("Vector store initialized successfully")
         except Exception as e:
@@ -49,9 +67,10 @@ class VectorStore:
                 "created_at": datetime.now().isoformat(),
                 "text_hash": embedding_data["text_hash"]
             })
+            self._positions.setdefault(code_id, len(self.metadata) - 1)
             
-            # Save to file
-            await self.save_store()
+            # Persisted by the background flush
+            self._dirty = True
             
             return code_id
             
@@ -93,34 +112,33 @@ class VectorStore:
 
     async def get_code_by_id(self, code_id: str) -> Optional[Dict[str, Any]]:
         """Get code by ID."""
-        for metadata in self.metadata:
-            if metadata["id"] == code_id:
-                return metadata
-        return None
+        i = self._positions.get(code_id)
+        return self.metadata[i] if i is not None else None
 
     async def update_code(self, code_id: str, code: str, metadata: Dict[str, Any] = None) -> bool:
         """Update existing code."""
         try:
-            for i, meta in enumerate(self.metadata):
-                if meta["id"] == code_id:
-                    # Generate new embedding
-                    embedding_data = await self.embedding_service.generate_code_embeddings(code, metadata)
-                    embedding = embedding_data["embedding"]
-                    
-                    # Update data
-                    self.embeddings[i] = embedding
-                    self.metadata[i].update({
-                        "code": code,
-                        "metadata": metadata or meta["metadata"],
-                        "updated_at": datetime.now().isoformat(),
-                        "text_hash": embedding_data["text_hash"]
-                    })
-                    
-                    # Save to file
-                    await self.save_store()
-                    return True
-            
-            return False
+            i = self._positions.get(code_id)
+            if i is None:
+                return False
+
+            # Generate new embedding
+            embedding_data = await self.embedding_service.generate_code_embeddings(code, metadata)
+            embedding = embedding_data["embedding"]
+
+            # Update data
+            meta = self.metadata[i]
+            self.embeddings[i] = embedding
+            meta.update({
+                "code": code,
+                "metadata": metadata or meta["metadata"],
+                "updated_at": datetime.now().isoformat(),
+                "text_hash": embedding_data["text_hash"]
+            })
+
+            # Persisted by the background flush
+            self._dirty = True
+            return True
             
         except Exception as e:
             print(f"Failed to update code: {e}")
@@ -129,17 +147,18 @@ class VectorStore:
     async def delete_code(self, code_id: str) -> bool:
         """Delete code from the store."""
         try:
-            for i, metadata in enumerate(self.metadata):
-                if metadata["id"] == code_id:
-                    # Remove from both lists
-                    del self.embeddings[i]
-                    del self.metadata[i]
-                    
-                    # Save to file
-                    await self.save_store()
-                    return True
-            
-            return False
+            i = self._positions.get(code_id)
+            if i is None:
+                return False
+
+            # Remove from both lists; later positions shift down by one
+            del self.embeddings[i]
+            del self.metadata[i]
+            self._reindex()
+
+            # Persisted by the background flush
+            self._dirty = True
+            return True
             
         except Exception as e:
             print(f"Failed to delete code: {e}")
@@ -157,10 +176,10 @@ class VectorStore:
         """Load vector store from file."""
         try:
             if os.path.exists(self.store_file):
-                with open(self.store_file, 'r') as f:
-                    data = json.load(f)
-                    self.embeddings = data.get("embeddings", [])
-                    self.metadata = data.get("metadata", [])
+                # Read and parse off the event loop; the file holds every embedding
+                data = await asyncio.to_thread(self._read_store)
+                self.embeddings = data.get("embeddings", [])
+                self.metadata = data.get("metadata", [])
             else:
                 self.embeddings = []
                 self.metadata = []
@@ -168,32 +187,65 @@ class VectorStore:
             print(f"Failed to load vector store: {e}")
             self.embeddings = []
             self.metadata = []
+        self._reindex()
+
+    def _read_store(self) -> Dict[str, Any]:
+        with open(self.store_file, 'rb') as f:
+            return orjson.loads(f.read())
 
     async def save_store(self):
-        """Save vector store to file."""
+        """Save vector store to file (off the event loop, replacing the file atomically)."""
+        # Snapshot on the event loop so the writer thread never sees a half-applied update
+        data = {
+            "embeddings": list(self.embeddings),
+            "metadata": [dict(metadata) for metadata in self.metadata],
+            "updated_at": datetime.now().isoformat()
+        }
         try:
-            data = {
-                "embeddings": self.embeddings,
-                "metadata": self.metadata,
-                "updated_at": datetime.now().isoformat()
-            }
-            
-            with open(self.store_file, 'w') as f:
-                json.dump(data, f, indent=2)
-                
+            await asyncio.to_thread(self._write_store, data)
         except Exception as e:
             print(f"Failed to save vector store: {e}")
+            self._dirty = True
+
+    def _write_store(self, data: Dict[str, Any]):
+        tmp_file = f"{self.store_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            # Make sure the new contents are on disk before they replace the old file
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.store_file)
+
+    async def flush(self):
+        """Persist pending changes, if any."""
+        if self._dirty:
+            self._dirty = False
+            await self.save_store()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def close(self):
+        """Stop the background flush and persist pending changes."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
 
     def generate_code_id(self, code: str, metadata: Dict[str, Any] = None) -> str:
         """Generate a unique ID for code."""
-        import hashlib
-        
         # Create a hash based on code and metadata
         content = code
         if metadata:
             content += json.dumps(metadata, sort_keys=True)
         
-        return hashlib.md5(content.encode()).hexdigest()
+        return content_hash(content)
 
     def matches_filters(self, metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
         """Check if metadata matches the provided filters."""
@@ -202,4 +254,7 @@ class VectorStore:
                 return False
             if metadata["metadata"][key] != value:
                 return False
-        return True
\ No newline at end of file
+        return True
+
+# Global vector store instance, initialized and closed with the application
+vector_store = VectorStore()
@@ -1,4 +1,5 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import aiohttp
 import asyncio
 import os
 import requests
@@ -196,39 +197,41 @@ class GitHubIntegration:
         timeout = self.timeout_manager.get_timeout("test_connection")
 
         async def _test_connection():
-            import aiohttp
-
             headers = {
                 "Authorization": f"token {self.token}",
                 "Accept": "application/vnd.github.v3+json"
             }
 
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-                async with session.get(f"{self.api_base}/user", headers=headers) as response:
-                    if response.status == 200:
-                        user_data = await response.json()
-                        return {
-                            "success": True,
-                            "message": f"Successfully connected to GitHub as {user_data.get('login')}",
-                            "details": {
-                                "user": user_data.get("login"),
-                                "name": user_data.get("name"),
-                                "public_repos": user_data.get("public_repos")
-                            }
-                        }
-                    elif response.status == 401:
-                        return {
-                            "success": False,
-                            "message": "Invalid GitHub token",
-                            "details": {"error": "Authentication failed"}
-                        }
-                    else:
-                        error_text = await response.text()
-                        return {
-                            "success": False,
-                            "message": f"GitHub API error: {response.status}",
-                            "details": {"error": error_text}
+            session = _get_session()
+            async with session.get(
+                f"{self.api_base}/user",
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status == 200:
+                    user_data = await response.json()
+                    return {
+                        "success": True,
+                        "message": f"Successfully connected to GitHub as {user_data.get('login')}",
+                        "details": {
+                            "user": user_data.get("login"),
+                            "name": user_data.get("name"),
+                            "public_repos": user_data.get("public_repos")
                         }
+                    }
+                elif response.status == 401:
+                    return {
+                        "success": False,
+                        "message": "Invalid GitHub token",
+                        "details": {"error": "Authentication failed"}
+                    }
+                else:
+                    error_text = await response.text()
+                    return {
+                        "success": False,
+                        "message": f"GitHub API error: {response.status}",
+                        "details": {"error": error_text}
+                    }
 
         try:
             result = await self.circuit_breaker.call(_test_connection)
@@ -291,4 +294,26 @@ class GitHubIntegration:
             "test_connection_timeout": self.timeout_manager.config.test_connection_timeout,
             "get_status_timeout": self.timeout_manager.config.get_status_timeout,
             "setup_timeout": self.timeout_manager.config.setup_timeout
-        }
\ No newline at end of file
+        }
+
+
+_session: Optional[aiohttp.ClientSession] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get the process-wide GitHub session so calls reuse pooled keep-alive connections."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=int(os.getenv("GITHUB_MAX_CONNECTIONS", "100")),
+                keepalive_timeout=75
+            )
+        )
+    return _session
+
+async def close_github_session():
+    """Close the shared GitHub session."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -98,11 +98,53 @@ class GitHubExtendedIntegration:
             timeout=float(os.getenv("GITHUB_EXTENDED_CIRCUIT_BREAKER_TIMEOUT", "30.0"))
         ))
 
-        # Configure httpx client with timeout
+        # Configure a pooled httpx client so keep-alive connections are reused across calls
         timeout_config = httpx.Timeout(
             timeout=self.timeout_manager.config.default_timeout
         )
-        self.client = httpx.AsyncClient(timeout=timeout_config)
+        limits_config = httpx.Limits(
+            max_connections=int(os.getenv("GITHUB_EXTENDED_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("GITHUB_EXTENDED_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        )
+        self.client = httpx.AsyncClient(timeout=timeout_config, limits=limits_config)
+        # List endpoints follow Link rel="next" up to this many pages of 100
+        self.max_pages = int(os.getenv("GITHUB_EXTENDED_MAX_PAGES", "10"))
+
+    async def _get_all_pages(self, path: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """GET a list endpoint, following pagination links."""
+        url = f"{self.api_base}{path}"
+        params = {**(params or {}), "per_page": 100}
+        items = []
+        for _ in range(self.max_pages):
+            response = await self.client.get(url, headers=self.headers, params=params)
+            response.raise_for_status()
+            items.extend(response.json())
+
+            next_link = response.links.get("next")
+            if not next_link:
+                break
+            # The next URL already carries the query string
+            url, params = next_link["url"], None
+        return items
+
+    async def _get(self, path: str, params: Dict[str, Any] = None) -> Any:
+        """GET a single page from the API."""
+        response = await self.client.get(f"{self.api_base}{path}", headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _count(self, path: str, params: Dict[str, Any] = None) -> int:
+        """Count the items of a list endpoint with one request (per_page=1, read the last page number)."""
+        response = await self.client.get(
+            f"{self.api_base}{path}",
+            headers=self.headers,
+            params={**(params or {}), "per_page": 1}
+        )
+        response.raise_for_status()
+        last_link = response.links.get("last")
+        if last_link:
+            return int(httpx.URL(last_link["url"]).params.get("page", "1"))
+        return len(response.json())
 
     async def list_repos(self) -> List[Dict[str, Any]]:
         """List all repositories with timeout and circuit breaker protection."""
@@ -110,13 +152,7 @@ class GitHubExtendedIntegration:
             return []
 
         async def _list_repos():
-            response = await self.client.get(
-                f"{self.api_base}/user/repos",
-                headers=self.headers,
-                params={"type": "all", "per_page": 100}
-            )
-            response.raise_for_status()
-            return response.json()
+            return await self._get_all_pages("/user/repos", {"type": "all"})
 
         try:
             return await self.circuit_breaker.call(_list_repos)
@@ -161,13 +197,7 @@ class GitHubExtendedIntegration:
             return []
 
         async def _list_issues():
-            response = await self.client.get(
-                f"{self.api_base}/repos/{owner}/{repo}/issues",
-                headers=self.headers,
-                params={"state": state, "per_page": 100}
-            )
-            response.raise_for_status()
-            return response.json()
+            return await self._get_all_pages(f"/repos/{owner}/{repo}/issues", {"state": state})
 
         try:
             return await self.circuit_breaker.call(_list_issues)
@@ -205,13 +235,7 @@ class GitHubExtendedIntegration:
             return []
 
         async def _list_prs():
-            response = await self.client.get(
-                f"{self.api_base}/repos/{owner}/{repo}/pulls",
-                headers=self.headers,
-                params={"state": state, "per_page": 100}
-            )
-            response.raise_for_status()
-            return response.json()
+            return await self._get_all_pages(f"/repos/{owner}/{repo}/pulls", {"state": state})
 
         try:
             return await self.circuit_breaker.call(_list_prs)
@@ -270,13 +294,7 @@ class GitHubExtendedIntegration:
             return []
 
         async def _list_releases():
-            response = await self.client.get(
-                f"{self.api_base}/repos/{owner}/{repo}/releases",
-                headers=self.headers,
-                params={"per_page": 100}
-            )
-            response.raise_for_status()
-            return response.json()
+            return await self._get_all_pages(f"/repos/{owner}/{repo}/releases")
 
         try:
             return await self.circuit_breaker.call(_list_releases)
@@ -364,14 +382,21 @@ class GitHubExtendedIntegration:
             return {"error": "Not configured"}
 
         async def _get_flow_status():
-            issues = await self.list_issues(owner, repo, state="open")
-            prs = await self.list_prs(owner, repo, state="open")
-            releases = await self.list_releases(owner, repo)
+            # Only counts are needed, so avoid paginating full lists: a handful of
+            # single-page requests, run concurrently
+            repo_data, prs_open, recent_prs, releases_total = await asyncio.gather(
+                self._get(f"/repos/{owner}/{repo}"),
+                self._count(f"/repos/{owner}/{repo}/pulls", {"state": "open"}),
+                self._get(f"/repos/{owner}/{repo}/pulls", {"state": "open", "per_page": 5}),
+                self._count(f"/repos/{owner}/{repo}/releases")
+            )
 
             # Get PR status
+            pr_checks = await asyncio.gather(
+                *(self.get_checks(owner, repo, pr["head"]["sha"]) for pr in recent_prs)
+            )
             pr_details = []
-            for pr in prs[:5]:  # Limit to recent PRs
-                checks = await self.get_checks(owner, repo, pr["head"]["sha"])
+            for pr, checks in zip(recent_prs, pr_checks):
                 pr_details.append({
                     "number": pr["number"],
                     "title": pr["title"],
@@ -385,9 +410,10 @@ class GitHubExtendedIntegration:
 
             return {
                 "repo": f"{owner}/{repo}",
-                "issues_open": len(issues),
-                "prs_open": len(prs),
-                "releases_total": len(releases),
+                # Like the issues list endpoint, open_issues_count includes open PRs
+                "issues_open": repo_data["open_issues_count"],
+                "prs_open": prs_open,
+                "releases_total": releases_total,
                 "recent_prs": pr_details,
                 "timestamp": datetime.now().isoformat()
             }
@@ -484,3 +510,20 @@ class GitHubExtendedIntegration:
             "get_flow_status_timeout": self.timeout_manager.config.get_flow_status_timeout
         }
 
+
+# Shared instance so every route reuses one connection pool
+_github_extended: Optional[GitHubExtendedIntegration] = None
+
+def get_github_extended() -> GitHubExtendedIntegration:
+    """Get the process-wide GitHubExtendedIntegration (usable as a FastAPI dependency)."""
+    global _github_extended
+    if _github_extended is None:
+        _github_extended = GitHubExtendedIntegration()
+    return _github_extended
+
+async def close_github_extended():
+    """Close the shared integration's HTTP client."""
+    global _github_extended
+    if _github_extended is not None:
+        await _github_extended.close()
+        _github_extended = None
@@ -0,0 +1,125 @@
+"""
+Response cache for deterministic LLM calls.
+Two tiers: an in-process LRU (L1) and an optional shared Redis cache (L2).
+"""
+
+from typing import Any, Dict, Optional, Protocol
+import hashlib
+import logging
+import os
+
+import orjson
+
+from ..cache import TTLCache
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    """Storage tier for cached completions."""
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]: ...
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None: ...
+
+
+class InMemoryLRU:
+    """Per-process LRU with a fixed TTL."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        self._cache.set(key, value)
+
+
+class RedisBackend:
+    """Redis tier shared by all workers. Errors are logged and treated as misses."""
+
+    def __init__(self, url: str, ttl: float = 3600.0, prefix: str = "llm:"):
+        self._redis = aioredis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = await self._redis.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {str(e)}")
+            return None
+        return orjson.loads(data) if data is not None else None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            await self._redis.set(self.prefix + key, orjson.dumps(value), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {str(e)}")
+
+
+class LLMCache:
+    """Looks up completions in L1, then L2 (promoting hits to L1)."""
+
+    def __init__(self, l1: CacheBackend, l2: Optional[CacheBackend] = None):
+        self.l1 = l1
+        self.l2 = l2
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Stable key for a chat completion request (model, messages, sampling params)."""
+        return hashlib.sha256(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self.l1.get(key)
+        if value is None and self.l2 is not None:
+            value = await self.l2.get(key)
+            if value is not None:
+                await self.l1.set(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        await self.l1.set(key, value)
+        if self.l2 is not None:
+            await self.l2.set(key, value)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "backends": ["memory"] + (["redis"] if self.l2 is not None else [])
+        }
+
+
+def create_llm_cache() -> Optional[LLMCache]:
+    """Build the LLM cache from environment settings (None when disabled)."""
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() != "true":
+        return None
+
+    ttl = float(os.getenv("LLM_CACHE_TTL", "3600"))
+    l1 = InMemoryLRU(maxsize=int(os.getenv("LLM_CACHE_MAXSIZE", "10000")), ttl=ttl)
+
+    l2 = None
+    redis_url = os.getenv("LLM_CACHE_REDIS_URL")
+    if redis_url and REDIS_AVAILABLE:
+        l2 = RedisBackend(redis_url, ttl=ttl)
+    elif redis_url:
+        logger.warning("LLM_CACHE_REDIS_URL set but redis is not installed - using in-memory cache only")
+
+    return LLMCache(l1, l2)
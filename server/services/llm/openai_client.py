@@ -1,7 +1,6 @@
-import openai
-from openai import AsyncOpenAI
+import aiohttp
 import os
-from typing import Dict, Any, List, Optional, Callable
+from typing import AsyncIterator, Dict, Any, List, Optional, Callable
 import asyncio
 import time
 import logging
@@ -10,6 +9,11 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 from dataclasses import dataclass
 from enum import Enum
 
+import orjson
+
+from .cache import create_llm_cache
+from .rate_limit import create_bucket, parse_retry_after
+
 logger = logging.getLogger(__name__)
 
 class CircuitBreakerState(Enum):
@@ -172,6 +176,106 @@ def timeout_wrapper(timeout_seconds: float):
         return wrapper
     return decorator
 
+ANALYZE_CODE_SYSTEM_PROMPT = "You are an expert code analyst. Provide detailed analysis of code quality, performance, and suggestions for improvement."
+
+BATCH_ANALYSIS_SYSTEM_PROMPT = (
+    ANALYZE_CODE_SYSTEM_PROMPT
+    + " You will receive a JSON array of objects with \"id\" and \"code\"."
+    + " Analyze each item independently and return only a JSON object:"
+    + " {\"analyses\": [{\"id\": <id>, \"analysis\": \"<analysis>\"}, ...]}"
+)
+
+@dataclass(frozen=True)
+class ChatTask:
+    """A single-prompt completion: its system prompt and response shape."""
+    system_prompt: str
+    result_key: str
+    mock_result: str
+    fallback_label: str
+
+CHAT_TASKS: Dict[str, ChatTask] = {
+    "analyze_code": ChatTask(
+        ANALYZE_CODE_SYSTEM_PROMPT,
+        "analysis",
+        "Mock analysis: Code quality assessment would appear here with API key configured.",
+        "Analysis"
+    ),
+    "explain_code": ChatTask(
+        "You are an expert code explainer. Provide clear, detailed explanations of code functionality, structure, and purpose.",
+        "explanation",
+        "Mock explanation: Detailed code explanation would appear here with API key configured.",
+        "Code explanation"
+    ),
+    "generate_tests": ChatTask(
+        "You are an expert test generator. Create comprehensive, well-structured tests that cover functionality, edge cases, and error conditions.",
+        "tests",
+        "Mock tests: Test cases would be generated here with API key configured.",
+        "# Test generation"
+    ),
+    "generate_code": ChatTask(
+        "You are an expert code generator. Generate clean, efficient, and well-documented code that follows best practices.",
+        "code",
+        "# Mock code: Generated code would appear here with API key configured.\ndef example():\n    pass",
+        "# Code generation"
+    ),
+    "optimize_code": ChatTask(
+        "You are an expert code optimizer. Provide optimized versions of code with improved performance, readability, and maintainability.",
+        "optimized_code",
+        "# Mock optimized code: Optimized version would appear here with API key configured.\ndef optimized_example():\n    pass",
+        "# Code optimization"
+    )
+}
+
+@dataclass(frozen=True)
+class ModelLimits:
+    """What a chat model accepts: its output token ceiling and whether it supports JSON mode."""
+    max_output_tokens: int
+    json_mode: bool
+
+# Matched by longest model-name prefix; plain gpt-4 (8k context) has no JSON mode
+MODEL_LIMITS: Dict[str, ModelLimits] = {
+    "gpt-4": ModelLimits(4096, False),
+    "gpt-4-0613": ModelLimits(4096, False),
+    "gpt-4-32k": ModelLimits(4096, False),
+    "gpt-4-1106": ModelLimits(4096, True),
+    "gpt-4-0125": ModelLimits(4096, True),
+    "gpt-4-turbo": ModelLimits(4096, True),
+    "gpt-4o": ModelLimits(16384, True),
+    "gpt-3.5-turbo": ModelLimits(4096, True),
+    "gpt-3.5-turbo-0613": ModelLimits(4096, False),
+}
+
+def get_model_limits(model: str) -> Optional[ModelLimits]:
+    """Look up a model's limits by the longest matching name prefix (None if unknown)."""
+    prefix = max((p for p in MODEL_LIMITS if model.startswith(p)), key=len, default=None)
+    return MODEL_LIMITS[prefix] if prefix else None
+
+def _parse_batch_analyses(content: str) -> Dict[int, str]:
+    """Extract {id: analysis} from a batched completion.
+
+    JSON mode replies are parsed as is. Models without JSON mode may wrap the
+    reply in prose or a code fence, so the outermost JSON value is cut out first.
+    Both {"analyses": [...]} and a bare array are accepted.
+    """
+    try:
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        starts = [i for i in (content.find("{"), content.find("[")) if i != -1]
+        if not starts:
+            raise ValueError("Batched analysis response did not contain JSON")
+        start = min(starts)
+        end = content.rfind("}" if content[start] == "{" else "]")
+        data = orjson.loads(content[start:end + 1])
+
+    items = data.get("analyses") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise ValueError("Batched analysis response did not contain an \"analyses\" array")
+    return {
+        int(item["id"]): item["analysis"]
+        for item in items
+        if isinstance(item, dict) and "id" in item and "analysis" in item
+    }
+
 class OpenAIClient:
     def __init__(self):
         self.api_key = os.getenv("OPENAI_API_KEY")
@@ -179,24 +283,65 @@ class OpenAIClient:
         self.model = os.getenv("OPENAI_MODEL", "gpt-4")
         self.max_tokens = int(os.getenv("OPENAI_MAX_TOKENS", "4000"))
         self.temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
+        # Batched analyses scale max_tokens with batch size, up to this ceiling
+        # (and never past the model's own output limit)
+        self.batch_max_tokens = int(os.getenv("OPENAI_BATCH_MAX_TOKENS", "4096"))
 
         # Initialize timeout and circuit breaker components
         self.timeout_manager = TimeoutManager()
         self.circuit_breaker = CircuitBreaker()
 
-        if not self.api_key:
-            # Don't raise error, allow it to be initialized without API key for development
-            self.client = None
-        else:
-            self.client = AsyncOpenAI(
-                api_key=self.api_key,
-                organization=self.organization if self.organization else None
+        # Chat completions are POSTed directly over a shared aiohttp session
+        self._base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+        self._headers = {}
+        if self.api_key:
+            self._headers["Authorization"] = f"Bearer {self.api_key}"
+        if self.organization:
+            self._headers["OpenAI-Organization"] = self.organization
+        # Without an API key the client runs in mock mode (useful for development)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Deterministic (temperature 0) completions are served from cache when possible
+        self.cache = create_llm_cache()
+
+        # Requests are paced below the account's limits (0 disables); 429s wait out Retry-After
+        self._request_bucket = create_bucket(float(os.getenv("OPENAI_RPM_LIMIT", "0")))
+        self._token_bucket = create_bucket(float(os.getenv("OPENAI_TPM_LIMIT", "0")))
+        self.rate_limit_retries = int(os.getenv("OPENAI_RATE_LIMIT_RETRIES", "2"))
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use.
+
+        The session is kept for the life of its event loop, so keep-alive TLS
+        connections are reused across requests. A caller on another loop (e.g.
+        a worker using asyncio.run per task) gets a fresh session instead of
+        one whose connections belong to a dead loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            # Connections can't be closed from a different loop; drop them
+            self._session.detach()
+            self._session = None
+        if self._session is None or self._session.closed:
+            self._session_loop = loop
+            max_connections = int(os.getenv("OPENAI_MAX_CONNECTIONS", "200"))
+            self._session = aiohttp.ClientSession(
+                headers=self._headers,
+                connector=aiohttp.TCPConnector(
+                    limit=max_connections,
+                    limit_per_host=max_connections,
+                    keepalive_timeout=75
+                ),
+                # Per-operation deadlines are enforced by timeout_wrapper
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10.0)
             )
+        return self._session
 
     async def initialize(self):
         """Initialize the OpenAI client."""
         try:
-            if self.client:
+            if self.api_key:
                 # Test the connection
                 response = await self.test_connection()
                 if response.get("success"):
@@ -208,210 +353,338 @@ class OpenAIClient:
         except Exception as e:
             print(f"OpenAI client initialization error: {e}")
 
-    async def analyze_code(self, prompt: str) -> Dict[str, Any]:
-        """Analyze code using OpenAI with timeout and circuit breaker protection."""
-        if not self.client:
-            # Return mock response if no API key
-            return {
-                "success": True,
-                "analysis": "Mock analysis: Code quality assessment would appear here with API key configured.",
-                "usage": {}
-            }
-
-        timeout = self.timeout_manager.get_timeout("analyze_code")
+    async def aclose(self):
+        """Close the HTTP session and its pooled connections."""
+        if self._session is not None and not self._session.closed and self._session_loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    async def _chat(
+        self,
+        system: Optional[str],
+        user: str,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Run a chat completion and return its content and token usage."""
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": user})
+        payload = {
+            "model": model or self.model,
+            "messages": messages,
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": self.temperature if temperature is None else temperature
+        }
+        if response_format:
+            payload["response_format"] = response_format
+
+        cache_key = None
+        if self.cache is not None and payload["temperature"] == 0:
+            cache_key = self.cache.make_key(payload)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        data = await self._post_chat(payload)
+
+        usage = data.get("usage")
+        result = {
+            "content": data["choices"][0]["message"]["content"],
+            "usage": {
+                "prompt_tokens": usage.get("prompt_tokens"),
+                "completion_tokens": usage.get("completion_tokens"),
+                "total_tokens": usage.get("total_tokens")
+            } if usage else {}
+        }
+        if cache_key is not None:
+            await self.cache.set(cache_key, result)
+        return result
+
+    async def _post_chat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a chat completion within the configured rate limits."""
+        for attempt in range(self.rate_limit_retries + 1):
+            await self._wait_for_rate_limit()
+            async with self._get_session().post(f"{self._base_url}/chat/completions", json=payload) as response:
+                retry_after = parse_retry_after(response.headers) if response.status == 429 else None
+                if retry_after is None or attempt == self.rate_limit_retries:
+                    data = await self._read_json(response)
+                    break
+
+            logger.warning(f"OpenAI rate limited, retrying in {retry_after:.1f}s")
+            await asyncio.sleep(retry_after)
+
+        self._charge_tokens(data.get("usage"))
+        return data
+
+    async def _wait_for_rate_limit(self):
+        if self._request_bucket is not None:
+            await self._request_bucket.acquire()
+        if self._token_bucket is not None:
+            # Wait out tokens already spent beyond the per-minute budget
+            await self._token_bucket.acquire(0)
+
+    def _charge_tokens(self, usage: Optional[Dict[str, Any]]):
+        if self._token_bucket is not None and usage:
+            self._token_bucket.consume(usage.get("total_tokens") or 0)
+
+    async def _chat_stream(self, operation: str, system: str, user: str, usage: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Stream a chat completion's content deltas as they arrive (server-sent events).
+
+        Token usage from the final frame is copied into `usage` when given.
+        """
+        if not self.circuit_breaker._should_attempt_request():
+            raise Exception("Circuit breaker is OPEN - service temporarily unavailable")
 
-        @timeout_wrapper(timeout)
-        async def _analyze_code():
-            return await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert code analyst. Provide detailed analysis of code quality, performance, and suggestions for improvement."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "system", "content": system}, {"role": "user", "content": user}],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        # Bound the wait between chunks rather than the whole generation
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10.0, sock_read=self.timeout_manager.get_timeout(operation))
 
+        await self._wait_for_rate_limit()
         try:
-            response = await self.circuit_breaker.call(_analyze_code)
+            async with self._get_session().post(f"{self._base_url}/chat/completions", json=payload, timeout=timeout) as response:
+                if response.status >= 400:
+                    await self._read_json(response)
+
+                async for line in response.content:
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+
+                    chunk = orjson.loads(data)
+                    if chunk.get("usage"):
+                        self._charge_tokens(chunk["usage"])
+                        if usage is not None:
+                            usage.update(chunk["usage"])
+                    for choice in chunk.get("choices") or ():
+                        content = (choice.get("delta") or {}).get("content")
+                        if content:
+                            yield content
+        except Exception:
+            self.circuit_breaker._record_failure()
+            raise
+        self.circuit_breaker._record_success()
+
+    @staticmethod
+    async def _read_json(response: aiohttp.ClientResponse) -> Any:
+        """Decode an API response, raising on HTTP errors."""
+        data = await response.json(content_type=None)
+        if response.status >= 400:
+            error = data.get("error", {}) if isinstance(data, dict) else {}
+            raise Exception(f"OpenAI API error {response.status}: {error.get('message', data)}")
+        return data
+
+    async def _complete(self, operation: str, system: str, prompt: str, scale: int = 1, **chat_options) -> Dict[str, Any]:
+        """Run a chat completion with the operation's timeout and circuit breaker protection.
+
+        `scale` multiplies the operation's timeout, for requests that carry several prompts.
+        """
+        async def _call():
+            return await self._chat(system, prompt, **chat_options)
+        _call.__name__ = operation
+
+        timeout = self.timeout_manager.get_timeout(operation) * scale
+        return await self.circuit_breaker.call(timeout_wrapper(timeout)(_call))
+
+    async def _invoke(self, operation: str, prompt: str) -> Dict[str, Any]:
+        """Run a CHAT_TASKS completion with timeout and circuit breaker protection."""
+        task = CHAT_TASKS[operation]
+        if not self.api_key:
+            # Return mock response if no API key
+            return {"success": True, task.result_key: task.mock_result, "usage": {}}
 
-            return {
-                "success": True,
-                "analysis": response.choices[0].message.content,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                } if response.usage else {}
-            }
+        try:
+            result = await self._complete(operation, task.system_prompt, prompt)
+            return {"success": True, task.result_key: result["content"], "usage": result["usage"]}
 
         except Exception as e:
-            logger.error(f"analyze_code failed: {str(e)}")
-            return self._fallback_response("analyze_code", str(e))
-
-    async def explain_code(self, prompt: str) -> Dict[str, Any]:
-        """Explain code using OpenAI with timeout and circuit breaker protection."""
-        if not self.client:
-            return {
-                "success": True,
-                "explanation": "Mock explanation: Detailed code explanation would appear here with API key configured.",
-                "usage": {}
-            }
-
-        timeout = self.timeout_manager.get_timeout("explain_code")
-
-        @timeout_wrapper(timeout)
-        async def _explain_code():
-            return await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert code explainer. Provide clear, detailed explanations of code functionality, structure, and purpose."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
+            logger.error(f"{operation} failed: {str(e)}")
+            return self._fallback_response(operation, str(e))
 
-        try:
-            response = await self.circuit_breaker.call(_explain_code)
+    async def analyze_code(self, prompt: str) -> Dict[str, Any]:
+        """Analyze code using OpenAI with timeout and circuit breaker protection."""
+        return await self._invoke("analyze_code", prompt)
 
-            return {
-                "success": True,
-                "explanation": response.choices[0].message.content,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                } if response.usage else {}
-            }
+    async def analyze_code_stream(self, prompt: str, usage: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Analyze code, yielding the analysis text as it is generated.
 
-        except Exception as e:
-            logger.error(f"explain_code failed: {str(e)}")
-            return self._fallback_response("explain_code", str(e))
+        Token usage is copied into `usage` once the stream completes. Errors are
+        raised to the caller, since part of the analysis may already have been sent.
+        """
+        if not self.api_key:
+            yield CHAT_TASKS["analyze_code"].mock_result
+            return
 
-    async def generate_tests(self, prompt: str) -> Dict[str, Any]:
-        """Generate tests using OpenAI with timeout and circuit breaker protection."""
-        if not self.client:
-            return {
-                "success": True,
-                "tests": "Mock tests: Test cases would be generated here with API key configured.",
-                "usage": {}
-            }
+        async for content in self._chat_stream("analyze_code", ANALYZE_CODE_SYSTEM_PROMPT, prompt, usage):
+            yield content
 
-        timeout = self.timeout_manager.get_timeout("generate_tests")
+    async def analyze_code_batch(self, prompts: List[str], batch_size: int = 8) -> List[Dict[str, Any]]:
+        """Analyze many snippets with one chat completion per batch_size prompts.
 
-        @timeout_wrapper(timeout)
-        async def _generate_tests():
-            return await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert test generator. Create comprehensive, well-structured tests that cover functionality, edge cases, and error conditions."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
+        Results are returned in prompt order, in the same shape as analyze_code().
+        Each batch's token usage is reported on the first result of that batch.
+        """
+        if not self.api_key:
+            return [await self.analyze_code(prompt) for prompt in prompts]
+
+        batches = [prompts[i:i + batch_size] for i in range(0, len(prompts), batch_size)]
+        results = await asyncio.gather(*(self._analyze_batch(batch) for batch in batches))
+        return [item for batch in results for item in batch]
+
+    async def _analyze_batch(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        numbered = [{"id": i, "code": prompt} for i, prompt in enumerate(prompts)]
+        # Give every snippet its own token and time budget so long batches aren't truncated,
+        # within what the model accepts
+        limits = get_model_limits(self.model)
+        max_tokens = min(self.max_tokens * len(prompts), self.batch_max_tokens)
+        if limits is not None:
+            max_tokens = min(max_tokens, limits.max_output_tokens)
+        chat_options = {"max_tokens": max_tokens}
+        if limits is not None and limits.json_mode:
+            chat_options["response_format"] = {"type": "json_object"}
 
         try:
-            response = await self.circuit_breaker.call(_generate_tests)
-
-            return {
-                "success": True,
-                "tests": response.choices[0].message.content,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                } if response.usage else {}
-            }
-
+            result = await self._complete(
+                "analyze_code",
+                BATCH_ANALYSIS_SYSTEM_PROMPT,
+                orjson.dumps(numbered).decode(),
+                scale=len(prompts),
+                **chat_options
+            )
+            analyses = _parse_batch_analyses(result["content"])
         except Exception as e:
-            logger.error(f"generate_tests failed: {str(e)}")
-            return self._fallback_response("generate_tests", str(e))
+            logger.error(f"analyze_code_batch failed: {str(e)}")
+            return [self._fallback_response("analyze_code", str(e)) for _ in prompts]
 
-    async def generate_code(self, prompt: str) -> Dict[str, Any]:
-        """Generate code using OpenAI with timeout and circuit breaker protection."""
-        if not self.client:
-            return {
-                "success": True,
-                "code": "# Mock code: Generated code would appear here with API key configured.\ndef example():\n    pass",
-                "usage": {}
-            }
+        results = []
+        for i in range(len(prompts)):
+            if i in analyses:
+                results.append({"success": True, "analysis": analyses[i], "usage": {}})
+            else:
+                results.append(self._fallback_response("analyze_code", "No analysis returned for this item"))
+        results[0]["usage"] = result["usage"]
+        return results
 
-        timeout = self.timeout_manager.get_timeout("generate_code")
+    async def submit_analysis_batch(self, prompts: List[str]) -> Dict[str, Any]:
+        """Queue analyses on the OpenAI Batch API (discounted, completes within 24h).
 
-        @timeout_wrapper(timeout)
-        async def _generate_code():
-            return await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert code generator. Generate clean, efficient, and well-documented code that follows best practices."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
+        Returns the batch object; collect results with get_analysis_batch_results().
+        """
+        if not self.api_key:
+            raise Exception("No OpenAI API key configured")
+
+        lines = b"\n".join(
+            orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": ANALYZE_CODE_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "max_tokens": self.max_tokens,
+                    "temperature": self.temperature
+                }
+            })
+            for i, prompt in enumerate(prompts)
+        )
+        form = aiohttp.FormData()
+        form.add_field("purpose", "batch")
+        form.add_field("file", lines, filename="analysis_batch.jsonl", content_type="application/jsonl")
+
+        session = self._get_session()
+        async with session.post(f"{self._base_url}/files", data=form) as response:
+            input_file = await self._read_json(response)
+        async with session.post(f"{self._base_url}/batches", json={
+            "input_file_id": input_file["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h"
+        }) as response:
+            return await self._read_json(response)
+
+    async def get_analysis_batch_results(self, batch_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Fetch results of a submitted batch in prompt order, or None if it is still running.
+
+        Always returns one result per submitted prompt. Requests that failed (listed in
+        the batch's error file) or are missing get a fallback response.
+        """
+        session = self._get_session()
+        async with session.get(f"{self._base_url}/batches/{batch_id}") as response:
+            batch = await self._read_json(response)
+
+        if batch["status"] in ("failed", "expired", "cancelled"):
+            raise Exception(f"Analysis batch {batch_id} {batch['status']}")
+        if batch["status"] != "completed":
+            return None
+
+        results: Dict[int, Dict[str, Any]] = {}
+        # The output file is null when every request failed, and vice versa
+        for file_id in (batch.get("output_file_id"), batch.get("error_file_id")):
+            if not file_id:
+                continue
+            async with session.get(f"{self._base_url}/files/{file_id}/content") as response:
+                if response.status >= 400:
+                    await self._read_json(response)
+                output = await response.read()
+
+            for line in output.splitlines():
+                item = orjson.loads(line)
+                body = (item.get("response") or {}).get("body") or {}
+                if item.get("error") or not body.get("choices"):
+                    results[int(item["custom_id"])] = self._fallback_response("analyze_code", str(item.get("error") or body))
+                else:
+                    results[int(item["custom_id"])] = {
+                        "success": True,
+                        "analysis": body["choices"][0]["message"]["content"],
+                        "usage": body.get("usage") or {}
+                    }
+
+        total = (batch.get("request_counts") or {}).get("total") or max(results, default=-1) + 1
+        return [
+            results.get(i) or self._fallback_response("analyze_code", "No result returned for this request")
+            for i in range(total)
+        ]
+
+    async def wait_for_analysis_batch(self, batch_id: str, poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+        """Poll a submitted batch until it completes (for background workers)."""
+        while True:
+            results = await self.get_analysis_batch_results(batch_id)
+            if results is not None:
+                return results
+            await asyncio.sleep(poll_interval)
 
-        try:
-            response = await self.circuit_breaker.call(_generate_code)
+    async def explain_code(self, prompt: str) -> Dict[str, Any]:
+        """Explain code using OpenAI with timeout and circuit breaker protection."""
+        return await self._invoke("explain_code", prompt)
 
-            return {
-                "success": True,
-                "code": response.choices[0].message.content,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                } if response.usage else {}
-            }
+    async def generate_tests(self, prompt: str) -> Dict[str, Any]:
+        """Generate tests using OpenAI with timeout and circuit breaker protection."""
+        return await self._invoke("generate_tests", prompt)
 
-        except Exception as e:
-            logger.error(f"generate_code failed: {str(e)}")
-            return self._fallback_response("generate_code", str(e))
+    async def generate_code(self, prompt: str) -> Dict[str, Any]:
+        """Generate code using OpenAI with timeout and circuit breaker protection."""
+        return await self._invoke("generate_code", prompt)
 
     async def optimize_code(self, prompt: str) -> Dict[str, Any]:
         """Optimize code using OpenAI with timeout and circuit breaker protection."""
-        if not self.client:
-            return {
-                "success": True,
-                "optimized_code": "# Mock optimized code: Optimized version would appear here with API key configured.\ndef optimized_example():\n    pass",
-                "usage": {}
-            }
-
-        timeout = self.timeout_manager.get_timeout("optimize_code")
-
-        @timeout_wrapper(timeout)
-        async def _optimize_code():
-            return await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert code optimizer. Provide optimized versions of code with improved performance, readability, and maintainability."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
-
-        try:
-            response = await self.circuit_breaker.call(_optimize_code)
-
-            return {
-                "success": True,
-                "optimized_code": response.choices[0].message.content,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                } if response.usage else {}
-            }
-
-        except Exception as e:
-            logger.error(f"optimize_code failed: {str(e)}")
-            return self._fallback_response("optimize_code", str(e))
+        return await self._invoke("optimize_code", prompt)
 
     async def test_connection(self) -> Dict[str, Any]:
         """Test OpenAI API connection with timeout and circuit breaker protection."""
-        if not self.client:
+        if not self.api_key:
             return {
                 "success": False,
                 "error": "No OpenAI API key configured"
@@ -421,14 +694,10 @@ class OpenAIClient:
 
         @timeout_wrapper(timeout)
         async def _test_connection():
-            return await self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": "Hello"}],
-                max_tokens=10
-            )
+            return await self._chat(None, "Hello", model="gpt-3.5-turbo", max_tokens=10)
 
         try:
-            response = await self.circuit_breaker.call(_test_connection)
+            await self.circuit_breaker.call(_test_connection)
 
             return {
                 "success": True,
@@ -448,47 +717,24 @@ class OpenAIClient:
         return {
             "total_requests": 0,
             "total_tokens": 0,
-            "total_cost": 0.0
+            "total_cost": 0.0,
+            "cache": self.cache.get_stats() if self.cache is not None else None
         }
 
     def _fallback_response(self, operation: str, error: str) -> Dict[str, Any]:
         """Generate fallback response for failed operations."""
-        fallbacks = {
-            "analyze_code": {
-                "success": False,
-                "analysis": f"Analysis temporarily unavailable due to service issues: {error}",
-                "usage": {},
-                "error": error
-            },
-            "explain_code": {
-                "success": False,
-                "explanation": f"Code explanation temporarily unavailable due to service issues: {error}",
-                "usage": {},
-                "error": error
-            },
-            "generate_tests": {
-                "success": False,
-                "tests": f"# Test generation temporarily unavailable due to service issues: {error}",
-                "usage": {},
-                "error": error
-            },
-            "generate_code": {
-                "success": False,
-                "code": f"# Code generation temporarily unavailable due to service issues: {error}",
-                "usage": {},
-                "error": error
-            },
-            "optimize_code": {
+        task = CHAT_TASKS.get(operation)
+        if task is None:
+            return {
                 "success": False,
-                "optimized_code": f"# Code optimization temporarily unavailable due to service issues: {error}",
-                "usage": {},
-                "error": error
+                "error": f"Operation '{operation}' failed: {error}"
             }
-        }
-        return fallbacks.get(operation, {
+        return {
             "success": False,
-            "error": f"Operation '{operation}' failed: {error}"
-        })
+            task.result_key: f"{task.fallback_label} temporarily unavailable due to service issues: {error}",
+            "usage": {},
+            "error": error
+        }
 
     def get_circuit_breaker_status(self) -> Dict[str, Any]:
         """Get circuit breaker status for monitoring."""
@@ -504,4 +750,20 @@ class OpenAIClient:
             "optimize_code_timeout": self.timeout_manager.config.optimize_code_timeout,
             "generate_tests_timeout": self.timeout_manager.config.generate_tests_timeout,
             "test_connection_timeout": self.timeout_manager.config.test_connection_timeout
-        }
\ No newline at end of file
+        }
+
+_openai_client: Optional[OpenAIClient] = None
+
+def get_openai_client() -> OpenAIClient:
+    """Get the process-wide OpenAIClient, sharing its connection pool and circuit breaker."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAIClient()
+    return _openai_client
+
+async def close_openai_client():
+    """Close the shared client's HTTP session."""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.aclose()
+        _openai_client = None
@@ -0,0 +1,60 @@
+"""
+Client-side rate limiting for LLM APIs.
+Paces requests below the account's RPM/TPM limits instead of reacting to 429s.
+"""
+
+from typing import Mapping, Optional
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate` units per second, up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        # Waiters are served in arrival order
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until `amount` units are available and take them (0 waits out any debt)."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+    def consume(self, amount: float):
+        """Charge units after the fact without waiting; the balance may go negative."""
+        self._refill()
+        self._tokens -= amount
+
+
+def create_bucket(per_minute: float) -> Optional[TokenBucket]:
+    """Bucket for a per-minute limit, allowing up to one second of burst (None when unlimited)."""
+    if per_minute <= 0:
+        return None
+    return TokenBucket(per_minute / 60.0)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds to wait from retry-after-ms / Retry-After headers, or None if absent."""
+    for name, scale in (("retry-after-ms", 0.001), ("Retry-After", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue
+    return None
@@ -4,14 +4,17 @@ from celery import Celery
 import os
 
 redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Broker can be pointed at RabbitMQ (amqp://...) while results stay in Redis
+broker_url = os.getenv("CELERY_BROKER_URL", redis_url)
 
 celery_app = Celery(
     "coding_agent",
-    broker=redis_url,
+    broker=broker_url,
     backend=redis_url
 )
 
 celery_app.conf.task_routes = {
+    'workers.tasks.record_dead_letter': {'queue': 'dead_letter'},
     'workers.tasks.*': {'queue': 'default'},
 }
 
@@ -21,5 +24,25 @@ celery_app.conf.update(
     result_serializer='json',
     timezone='UTC',
     enable_utc=True,
+    # Only ack after the task finished so a crashed worker doesn't lose it
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    result_expires=3600,
+    # Fail fast when the broker is down instead of blocking the publisher
+    broker_connection_timeout=5,
+    task_publish_retry_policy={
+        'max_retries': 2,
+        'interval_start': 0,
+        'interval_step': 0.5,
+        'interval_max': 1,
+    },
 )
 
+celery_app.conf.beat_schedule = {
+    # Keep monthly log partitions created ahead of the current month
+    'create-log-partitions': {
+        'task': 'workers.tasks.create_log_partitions_task',
+        'schedule': 24 * 60 * 60,
+    },
+}
+
@@ -2,9 +2,15 @@
 
 from celery import current_task
 from workers.celery_app import celery_app
+from database.schema import create_log_partitions, engine
+from sqlalchemy.exc import DBAPIError
 from typing import Dict, Any
+import asyncio
+import logging
 import time
 
+logger = logging.getLogger(__name__)
+
 @celery_app.task(bind=True)
 def long_running_analysis(self, code: str) -> Dict[str, Any]:
     """Run long-running code analysis."""
@@ -39,3 +45,46 @@ def test_generation_async(code: str, framework: str) -> Dict[str, Any]:
         "tests": ["# Test cases"]
     }
 
+
+
+class DeadLetterTask(celery_app.Task):
+    """Task base that forwards permanently failed tasks to the dead letter queue."""
+
+    # Only transient failures are worth retrying; anything else goes straight
+    # to the dead letter queue instead of failing the same way three more times
+    autoretry_for = (ConnectionError, TimeoutError, DBAPIError)
+    retry_backoff = True
+    retry_backoff_max = 60
+    retry_jitter = True
+    max_retries = 3
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        record_dead_letter.delay(self.name, task_id, args, kwargs, str(exc))
+
+
+@celery_app.task(name="workers.tasks.record_dead_letter")
+def record_dead_letter(task_name: str, task_id: str, args, kwargs, error: str) -> Dict[str, Any]:
+    """Park a permanently failed task on the dead letter queue for inspection."""
+    logger.error(f"Task {task_name} ({task_id}) moved to dead letter queue: {error}")
+    return {
+        "task_name": task_name,
+        "task_id": task_id,
+        "args": args,
+        "kwargs": kwargs,
+        "error": error
+    }
+
+
+async def _create_log_partitions():
+    try:
+        await create_log_partitions()
+    finally:
+        # Pooled connections are bound to this event loop, which asyncio.run closes
+        await engine.dispose()
+
+
+@celery_app.task(base=DeadLetterTask, name="workers.tasks.create_log_partitions_task")
+def create_log_partitions_task() -> Dict[str, Any]:
+    """Create upcoming monthly partitions for api_logs and cost_tracking."""
+    asyncio.run(_create_log_partitions())
+    return {"success": True}
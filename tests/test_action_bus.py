@@ -0,0 +1,135 @@
+"""
+Tests for the Action Bus and batched event emission.
+"""
+
+import asyncio
+import dataclasses
+import orjson
+import pytest
+
+from server.services.action_bus import ActionBus, EventBatcher, EventType
+
+
+class TestActionBusListing:
+    """Test cached list queries."""
+
+    @pytest.mark.asyncio
+    async def test_list_actions_is_cached_until_next_write(self):
+        """Test that repeated list calls reuse results and writes invalidate them."""
+        bus = ActionBus()
+        await bus.execute_action("create_spec", {"title": "first"})
+
+        first = bus.list_actions()
+        assert bus.list_actions() is first
+
+        await bus.execute_action("create_spec", {"title": "second"})
+        assert len(bus.list_actions()) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_events_sees_new_events(self):
+        """Test that emitting an event invalidates cached event listings."""
+        bus = ActionBus()
+        await bus.emit_event(EventType.SPEC_CREATED, "test", {})
+        assert len(bus.get_events()) == 1
+
+        await bus.emit_event(EventType.SPEC_APPROVED, "test", {})
+        assert len(bus.get_events()) == 2
+
+    @pytest.mark.asyncio
+    async def test_list_actions_json_is_refreshed_on_write(self):
+        """Test that serialized listings are reused and rebuilt after a write."""
+        bus = ActionBus()
+        await bus.execute_action("create_spec", {"title": "first"})
+
+        first = bus.list_actions_json()
+        assert bus.list_actions_json() is first
+        assert orjson.loads(first)[0]["status"] == "success"
+
+        await bus.execute_action("create_spec", {"title": "second"})
+        assert len(orjson.loads(bus.list_actions_json())) == 2
+
+    @pytest.mark.asyncio
+    async def test_events_are_immutable(self):
+        """Test that stored events are frozen, slotted dataclasses."""
+        bus = ActionBus()
+        await bus.emit_event(EventType.SPEC_CREATED, "test", {})
+        event = bus.events[0]
+
+        assert not hasattr(event, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            event.source = "other"
+
+
+class TestEventBatcher:
+    """Test batched event emission."""
+
+    @pytest.mark.asyncio
+    async def test_events_are_flushed_in_batches(self):
+        """Test that queued events reach the bus in a single bulk flush."""
+        bus = ActionBus()
+        flushed = []
+        original = bus.emit_events_bulk
+
+        async def record(events):
+            flushed.append(len(events))
+            await original(events)
+
+        bus.emit_events_bulk = record
+        batcher = EventBatcher(bus, flush_interval=0.05)
+        await batcher.start()
+
+        ids = [await batcher.submit(EventType.SPEC_CREATED, "test", {"i": i}) for i in range(20)]
+        await asyncio.sleep(0.1)
+        await batcher.stop()
+
+        assert flushed == [20]
+        assert [e.id for e in bus.events] == ids
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_batch_in_progress(self):
+        """Test that events already accepted by submit are stored when stopping mid-batch."""
+        bus = ActionBus()
+        batcher = EventBatcher(bus, flush_interval=10.0)
+        await batcher.start()
+
+        ids = [await batcher.submit(EventType.SPEC_CREATED, "test", {"i": i}) for i in range(5)]
+        await asyncio.sleep(0.01)  # the flush loop is now holding the batch
+        await batcher.stop()
+
+        assert [e.id for e in bus.events] == ids
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self):
+        """Test that submit raises QueueFull instead of growing without bound."""
+        bus = ActionBus()
+        release = asyncio.Event()
+        original = bus.emit_events_bulk
+
+        async def slow_flush(events):
+            await release.wait()
+            await original(events)
+
+        bus.emit_events_bulk = slow_flush
+        batcher = EventBatcher(bus, max_queue_size=1, flush_interval=0.01, put_timeout=0.01)
+        await batcher.start()
+
+        await batcher.submit(EventType.TEST_PASSED, "test", {"n": 1})
+        await asyncio.sleep(0.05)  # first event is now stuck in the flush
+        await batcher.submit(EventType.TEST_PASSED, "test", {"n": 2})
+        with pytest.raises(asyncio.QueueFull):
+            await batcher.submit(EventType.TEST_PASSED, "test", {"n": 3})
+
+        release.set()
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        assert len(bus.events) == 2
+
+    @pytest.mark.asyncio
+    async def test_submit_emits_directly_when_not_started(self):
+        """Test that events are not lost if the batcher was never started."""
+        bus = ActionBus()
+        batcher = EventBatcher(bus)
+
+        event_id = await batcher.submit(EventType.PR_CREATED, "test", {"pr": 1})
+
+        assert bus.events[0].id == event_id
@@ -0,0 +1,37 @@
+"""
+Tests for the Python AST parser.
+"""
+
+import pytest
+
+from server.services.indexer.ast_parser import ASTParser
+
+
+CODE = '''
+class Worker:
+    async def run(self, items):
+        for item in items:
+            if item and item.ready or item.forced:
+                with item.lock:
+                    yield item
+
+def helper(x):
+    try:
+        return x
+    except ValueError:
+        return None
+'''
+
+
+class TestASTParser:
+    """Test structural extraction from Python code."""
+
+    @pytest.mark.asyncio
+    async def test_complexity_and_nesting(self):
+        """Test complexity counting, nesting depth and async function coverage."""
+        result = await ASTParser().parse_python_code(CODE)
+
+        functions = {f["name"]: f["complexity"] for f in result["functions"]}
+        assert functions == {"run": 5, "helper": 2}
+        assert result["classes"][0]["methods"] == ["run"]
+        assert result["nesting_depth"] == 3
@@ -0,0 +1,60 @@
+"""
+Tests for batched append-only writes.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from server.services.batching import BatchWriter
+
+
+class TestBatchWriter:
+    """Test queueing, batching and dropping of rows."""
+
+    def test_add_is_noop_when_not_running(self):
+        """Test that rows are not queued before the writer is started."""
+        writer = BatchWriter("api_logs", columns=("endpoint",))
+        assert writer.add(endpoint="/") is False
+
+    @pytest.mark.asyncio
+    async def test_rows_are_copied_in_one_batch(self):
+        """Test that queued rows are flushed together with the configured columns."""
+        writer = BatchWriter("api_logs", columns=("endpoint", "status_code"), flush_interval=0.01)
+        with patch.object(writer, "_copy", AsyncMock()) as copy:
+            await writer.start()
+            for i in range(5):
+                assert writer.add(endpoint=f"/{i}", status_code=200)
+            await asyncio.sleep(0.05)
+            await writer.stop()
+
+        assert copy.await_count == 1
+        records = copy.await_args.args[0]
+        assert writer.columns == ("id", "endpoint", "status_code", "created_at")
+        assert [r[1:3] for r in records] == [(f"/{i}", 200) for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_batch_in_progress(self):
+        """Test that rows the flush loop is still collecting are written on stop."""
+        writer = BatchWriter("api_logs", columns=("endpoint",), flush_interval=10.0)
+        with patch.object(writer, "_copy", AsyncMock()) as copy:
+            await writer.start()
+            for i in range(5):
+                writer.add(endpoint=f"/{i}")
+            await asyncio.sleep(0.01)  # the flush loop is now holding the batch
+            await writer.stop()
+
+        assert sum(len(call.args[0]) for call in copy.await_args_list) == 5
+
+    @pytest.mark.asyncio
+    async def test_rows_are_dropped_when_queue_is_full(self):
+        """Test that a full queue drops rows instead of blocking, and stop flushes the rest."""
+        writer = BatchWriter("api_logs", columns=("endpoint",), max_queue_size=2)
+        with patch.object(writer, "_copy", AsyncMock()) as copy:
+            await writer.start()
+            results = [writer.add(endpoint="/") for _ in range(3)]
+            await writer.stop()
+
+        assert results == [True, True, False]
+        assert writer.dropped == 1
+        assert sum(len(call.args[0]) for call in copy.await_args_list) == 2
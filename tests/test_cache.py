@@ -0,0 +1,129 @@
+"""
+Tests for in-process caching helpers.
+"""
+
+import asyncio
+import random
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from server.services.cache import StaleWhileRevalidateCache, TTLCache
+
+
+class TestTTLCache:
+    """Test expiry and LRU eviction."""
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries are dropped once their TTL has passed."""
+        cache = TTLCache(ttl=1.0)
+        with patch("server.services.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value")
+            assert cache.get("key") == "value"
+        with patch("server.services.cache.time.monotonic", return_value=101.0):
+            assert cache.get("key") is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache stays within maxsize by evicting the LRU entry."""
+        cache = TTLCache(maxsize=2, ttl=60.0)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+
+class TestStaleWhileRevalidateCache:
+    """Test TTL, stale-while-revalidate and request coalescing behavior."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_hit_skips_loader(self):
+        """Test that fresh entries are served without calling the loader."""
+        cache = StaleWhileRevalidateCache(ttl=60.0, stale_ttl=600.0, beta=0)
+        loader = AsyncMock(return_value={"repo": "a/b"})
+
+        assert await cache.get(("a", "b"), loader) == {"repo": "a/b"}
+        assert await cache.get(("a", "b"), loader) == {"repo": "a/b"}
+        assert loader.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_coalesced(self):
+        """Test that concurrent loads for one key share a single upstream call."""
+        cache = StaleWhileRevalidateCache(ttl=60.0, beta=0)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return calls
+
+        results = await asyncio.gather(*(cache.get("key", loader) for _ in range(10)))
+
+        assert results == [1] * 10
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self):
+        """Test that stale entries are returned immediately and refreshed in the background."""
+        cache = StaleWhileRevalidateCache(ttl=10.0, stale_ttl=100.0, beta=0)
+        loader = AsyncMock(side_effect=["old", "new"])
+
+        with patch("server.services.cache.time.monotonic", return_value=1000.0):
+            assert await cache.get("key", loader) == "old"
+
+        with patch("server.services.cache.time.monotonic", return_value=1050.0):
+            assert await cache.get("key", loader) == "old"
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert await cache.get("key", loader) == "new"
+
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_values_are_not_stored(self):
+        """Test that values rejected by should_cache are reloaded each time."""
+        cache = StaleWhileRevalidateCache(should_cache=lambda value: "error" not in value)
+        loader = AsyncMock(return_value={"error": "Not configured"})
+
+        await cache.get("key", loader)
+        await cache.get("key", loader)
+
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_entries_are_bounded_and_expired_entries_dropped(self):
+        """Test LRU eviction past maxsize and removal of entries older than stale_ttl."""
+        cache = StaleWhileRevalidateCache(ttl=10.0, stale_ttl=100.0, beta=0, maxsize=2)
+        loader = AsyncMock(return_value="value")
+
+        with patch("server.services.cache.time.monotonic", return_value=1000.0):
+            await cache.get("a", loader)
+            await cache.get("b", loader)
+            await cache.get("a", loader)
+            await cache.get("c", loader)
+            assert list(cache._entries) == ["a", "c"]
+
+        with patch("server.services.cache.time.monotonic", return_value=2000.0):
+            loader.side_effect = Exception("upstream down")
+            with pytest.raises(Exception):
+                await cache.get("a", loader)
+            assert "a" not in cache._entries
+
+    def test_early_refresh_draws_only_near_expiry(self):
+        """Test that XFetch skips the random draw far from expiry and is reproducible when seeded."""
+        rng = MagicMock(spec=random.Random)
+        rng.random.return_value = 0.999
+        cache = StaleWhileRevalidateCache(ttl=60.0, beta=1.0, rng=rng)
+
+        assert cache._should_refresh_early(age=1.0, duration=0.1) is False
+        assert rng.random.call_count == 0
+        assert cache._should_refresh_early(age=59.5, duration=0.1) is True
+        assert rng.random.call_count == 1
+
+        seeded = [StaleWhileRevalidateCache(ttl=60.0, rng=random.Random(7)) for _ in range(2)]
+        decisions = [[cache._should_refresh_early(58.0, 1.0) for _ in range(20)] for cache in seeded]
+        assert decisions[0] == decisions[1]
+        assert True in decisions[0] and False in decisions[0]
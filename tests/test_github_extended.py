@@ -0,0 +1,71 @@
+"""
+Tests for the extended GitHub integration.
+"""
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from server.services.integrations.github_extended import GitHubExtendedIntegration
+
+
+def _integration(handler):
+    with patch.dict("os.environ", {"GITHUB_TOKEN": "ghp_test"}):
+        integration = GitHubExtendedIntegration()
+    integration.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return integration
+
+
+class TestGitHubExtendedPagination:
+    """Test list endpoints and the combined flow status."""
+
+    @pytest.mark.asyncio
+    async def test_list_issues_follows_next_links(self):
+        """Test that every page is fetched, not just the first 100 items."""
+        def handler(request):
+            page = int(request.url.params.get("page", "1"))
+            headers = {}
+            if page < 3:
+                headers["Link"] = f'<https://api.github.com/repos/o/r/issues?state=open&per_page=100&page={page + 1}>; rel="next"'
+            return httpx.Response(200, json=[{"number": page}], headers=headers)
+
+        integration = _integration(handler)
+        issues = await integration.list_issues("o", "r")
+        await integration.close()
+
+        assert [issue["number"] for issue in issues] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_flow_status_counts_without_paginating(self):
+        """Test that flow status reads counts from single requests and checks recent PRs."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            path = request.url.path
+            if path == "/repos/o/r":
+                return httpx.Response(200, json={"open_issues_count": 250})
+            if path.endswith("/pulls"):
+                if request.url.params["per_page"] == "1":
+                    return httpx.Response(200, json=[{}], headers={
+                        "Link": '<https://api.github.com/repos/o/r/pulls?state=open&per_page=1&page=42>; rel="last"'
+                    })
+                return httpx.Response(200, json=[
+                    {"number": n, "title": f"PR {n}", "state": "open", "head": {"sha": f"sha{n}"}}
+                    for n in (1, 2)
+                ])
+            if path.endswith("/releases"):
+                return httpx.Response(200, json=[{}])
+            return httpx.Response(200, json={"check_runs": [
+                {"conclusion": "success", "status": "completed"},
+                {"conclusion": None, "status": "in_progress"}
+            ]})
+
+        integration = _integration(handler)
+        status = await integration.get_flow_status("o", "r")
+        await integration.close()
+
+        assert (status["issues_open"], status["prs_open"], status["releases_total"]) == (250, 42, 1)
+        assert [pr["number"] for pr in status["recent_prs"]] == [1, 2]
+        assert status["recent_prs"][0]["checks"] == {"total": 2, "passed": 1, "pending": 1}
+        assert len(requests) == 6
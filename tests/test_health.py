@@ -0,0 +1,79 @@
+"""
+Tests for the health check service.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+
+from server.services.health import HealthCheckService, ServiceHealth, SystemHealth
+
+
+class TestHealthCache:
+    """Test reuse of recent overall health reports."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_share_one_report(self):
+        """Test that concurrent and repeated calls within the TTL run a single check."""
+        service = HealthCheckService()
+        calls = 0
+
+        async def run_health_check():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return SystemHealth("healthy", datetime.now(), 0.0, [], {}, {}, [])
+
+        service._run_health_check = run_health_check
+        reports = await asyncio.gather(*(service.check_overall_health() for _ in range(5)))
+        reports.append(await service.check_overall_health())
+
+        assert calls == 1
+        assert all(report is reports[0] for report in reports)
+
+        service.health_cache_ttl = 0
+        await service.check_overall_health()
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_services_report_reuses_overall_check(self):
+        """Test that the per-service report doesn't probe services again."""
+        service = HealthCheckService()
+        calls = 0
+
+        async def run_health_check():
+            nonlocal calls
+            calls += 1
+            services = [ServiceHealth("openai", "healthy", 0.1, datetime.now())]
+            return SystemHealth("healthy", datetime.now(), 0.0, services, {}, {}, [])
+
+        service._run_health_check = run_health_check
+        await service.check_overall_health()
+        report = await service.check_services_health()
+
+        assert calls == 1
+        assert report["services"]["openai"]["status"] == "healthy"
+
+    @pytest.mark.asyncio
+    async def test_services_report_skips_system_resources(self):
+        """Test that the per-service report probes concurrently without sampling CPU."""
+        service = HealthCheckService()
+        in_flight = peak = 0
+
+        async def check_service_health(name, _service):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return ServiceHealth(name, "healthy", 0.01, datetime.now())
+
+        def get_system_resources():
+            raise AssertionError("system resources sampled for services report")
+
+        service._check_service_health = check_service_health
+        service._get_system_resources = get_system_resources
+        report = await service.check_services_health()
+
+        assert set(report["services"]) == set(service.services)
+        assert peak == len(service.services)
@@ -0,0 +1,32 @@
+"""
+Tests for the LLM response cache.
+"""
+
+import pytest
+
+from server.services.llm.cache import InMemoryLRU, LLMCache
+
+
+class TestLLMCache:
+    """Test key derivation and tiered lookups."""
+
+    def test_key_ignores_dict_ordering(self):
+        """Test that equivalent requests map to the same key."""
+        a = {"model": "gpt-4", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+        b = {"temperature": 0, "messages": [{"content": "hi", "role": "user"}], "model": "gpt-4"}
+
+        assert LLMCache.make_key(a) == LLMCache.make_key(b)
+        assert LLMCache.make_key(a) != LLMCache.make_key({**a, "max_tokens": 10})
+
+    @pytest.mark.asyncio
+    async def test_l2_hits_are_promoted_to_l1(self):
+        """Test that a shared-tier hit is copied into the in-process tier."""
+        l1, l2 = InMemoryLRU(), InMemoryLRU()
+        await l2.set("key", {"content": "shared"})
+        cache = LLMCache(l1, l2)
+
+        assert await cache.get("key") == {"content": "shared"}
+        assert await l1.get("key") == {"content": "shared"}
+        assert await cache.get("missing") is None
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
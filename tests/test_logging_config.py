@@ -0,0 +1,71 @@
+"""
+Tests for queued, structured logging.
+"""
+
+import logging
+import queue
+
+import orjson
+
+from server.api.logging_config import DeferredQueueHandler, JSONFormatter, setup_logging, stop_logging
+
+
+class TestJSONFormatter:
+    """Test structured log output."""
+
+    def test_extra_fields_are_included(self):
+        """Test that `extra` fields are emitted alongside the message."""
+        record = logging.makeLogRecord({
+            "name": "workflow",
+            "levelno": logging.ERROR,
+            "levelname": "ERROR",
+            "msg": "Flow status timed out for %s/%s",
+            "args": ("octo", "repo"),
+            "owner": "octo",
+        })
+
+        data = orjson.loads(JSONFormatter().format(record))
+
+        assert data["message"] == "Flow status timed out for octo/repo"
+        assert data["level"] == "ERROR"
+        assert data["owner"] == "octo"
+        assert "args" not in data
+
+
+class TestDeferredQueueHandler:
+    """Test that formatting is left to the listener thread."""
+
+    def test_records_are_queued_unformatted(self):
+        """Test that message args and exc_info are passed through untouched."""
+        log_queue = queue.SimpleQueue()
+        logger = logging.getLogger("test_deferred_queue_handler")
+        logger.propagate = False
+        logger.addHandler(DeferredQueueHandler(log_queue))
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed: %s", "action")
+
+        record = log_queue.get_nowait()
+        assert record.args == ("action",)
+        assert record.exc_info[0] is ValueError
+        assert record.exc_text is None
+
+
+class TestStopLogging:
+    """Test logging after the listener has stopped."""
+
+    def test_root_logs_directly_after_stop(self):
+        """Test that the queue handler is replaced by the listener's handlers on stop."""
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        try:
+            setup_logging()
+            assert isinstance(root.handlers[0], DeferredQueueHandler)
+
+            stop_logging()
+            assert root.handlers
+            assert not any(isinstance(handler, DeferredQueueHandler) for handler in root.handlers)
+        finally:
+            root.handlers, root.level = saved_handlers, saved_level
@@ -0,0 +1,363 @@
+"""
+Tests for the aiohttp-based OpenAI client.
+"""
+
+import asyncio
+import os
+
+import orjson
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from unittest.mock import patch
+
+from server.services.llm.openai_client import OpenAIClient
+
+
+async def _start_fake_openai(handler):
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+class TestOpenAIClientHTTP:
+    """Test chat completions over the shared session."""
+
+    @pytest.mark.asyncio
+    async def test_analyze_code_parses_completion(self):
+        """Test that responses are mapped to the existing result shape."""
+        requests = []
+
+        async def handler(request):
+            requests.append((request.headers.get("Authorization"), await request.json()))
+            return web.json_response({
+                "choices": [{"message": {"content": "Looks good"}}],
+                "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+            })
+
+        server = await _start_fake_openai(handler)
+        env = {"OPENAI_API_KEY": "sk-test", "OPENAI_BASE_URL": str(server.make_url("/v1"))}
+        try:
+            with patch.dict("os.environ", env):
+                client = OpenAIClient()
+            result = await client.analyze_code("def f(): pass")
+            await client.analyze_code("def g(): pass")
+            session = client._get_session()
+            await client.aclose()
+        finally:
+            await server.close()
+
+        assert result == {
+            "success": True,
+            "analysis": "Looks good",
+            "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+        }
+        assert requests[0][0] == "Bearer sk-test"
+        assert requests[0][1]["messages"][-1] == {"role": "user", "content": "def f(): pass"}
+        assert session.closed
+
+    def test_session_is_replaced_on_a_new_event_loop(self):
+        """Test that a session is reused within a loop but not across loops."""
+        client = OpenAIClient()
+
+        async def sessions():
+            return client._get_session(), client._get_session()
+
+        first, same = asyncio.run(sessions())
+        second, _ = asyncio.run(sessions())
+
+        assert first is same
+        assert second is not first
+        assert first.closed
+
+    @pytest.mark.asyncio
+    async def test_api_errors_use_fallback_response(self):
+        """Test that HTTP errors surface as the operation's fallback response."""
+        async def handler(request):
+            return web.json_response({"error": {"message": "rate limited"}}, status=429)
+
+        server = await _start_fake_openai(handler)
+        env = {"OPENAI_API_KEY": "sk-test", "OPENAI_BASE_URL": str(server.make_url("/v1"))}
+        try:
+            with patch.dict("os.environ", env):
+                client = OpenAIClient()
+            result = await client.generate_code("prompt")
+            await client.aclose()
+        finally:
+            await server.close()
+
+        assert result["success"] is False
+        assert "rate limited" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_deterministic_completions_are_cached(self):
+        """Test that temperature-0 requests reuse a cached completion."""
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            return web.json_response({"choices": [{"message": {"content": "cached"}}]})
+
+        server = await _start_fake_openai(handler)
+        env = {
+            "OPENAI_API_KEY": "sk-test",
+            "OPENAI_BASE_URL": str(server.make_url("/v1")),
+            "OPENAI_TEMPERATURE": "0"
+        }
+        try:
+            with patch.dict("os.environ", env):
+                client = OpenAIClient()
+            first = await client.explain_code("x = 1")
+            second = await client.explain_code("x = 1")
+            await client.explain_code("y = 2")
+            await client.aclose()
+        finally:
+            await server.close()
+
+        assert first == second
+        assert calls == 2
+        assert client.cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_requests_wait_for_retry_after(self):
+        """Test that a 429 is retried after Retry-After instead of failing."""
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return web.json_response({"error": {"message": "slow down"}}, status=429, headers={"Retry-After": "0"})
+            return web.json_response({
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}
+            })
+
+        server = await _start_fake_openai(handler)
+        env = {
+            "OPENAI_API_KEY": "sk-test",
+            "OPENAI_BASE_URL": str(server.make_url("/v1")),
+            "OPENAI_TPM_LIMIT": "600"
+        }
+        try:
+            with patch.dict("os.environ", env):
+                client = OpenAIClient()
+            result = await client.generate_code("prompt")
+            await client.aclose()
+        finally:
+            await server.close()
+
+        assert result["success"] is True
+        assert calls == 2
+        assert client._token_bucket._tokens < 6
+
+
+class TestOpenAIClientStreaming:
+    """Test streamed analysis."""
+
+    @pytest.mark.asyncio
+    async def test_analyze_code_stream_yields_deltas(self):
+        """Test that SSE deltas are yielded in order and usage is reported."""
+        bodies = []
+
+        async def handler(request):
+            bodies.append(await request.json())
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            frames = [
+                {"choices": [{"delta": {"role": "assistant"}}]},
+                {"choices": [{"delta": {"content": "Looks "}}]},
+                {"choices": [{"delta": {"content": "good"}}]},
+                {"choices": [], "usage": {"prompt_tokens": 4, "completion_tokens": 2, "total_tokens": 6}},
+            ]
+            for frame in frames:
+                await response.write(b"data: " + orjson.dumps(frame) + b"\n\n")
+            await response.write(b"data: [DONE]\n\n")
+            return response
+
+        server = await _start_fake_openai(handler)
+        env = {"OPENAI_API_KEY": "sk-test", "OPENAI_BASE_URL": str(server.make_url("/v1"))}
+        try:
+            with patch.dict("os.environ", env):
+                client = OpenAIClient()
+            usage = {}
+            chunks = [chunk async for chunk in client.analyze_code_stream("def f(): pass", usage)]
+            await client.aclose()
+        finally:
+            await server.close()
+
+        assert chunks == ["Looks ", "good"]
+        assert usage["total_tokens"] == 6
+        assert bodies[0]["stream"] is True
+        assert bodies[0]["stream_options"] == {"include_usage": True}
+
+
+class TestOpenAIClientBatching:
+    """Test batched analysis paths."""
+
+    @pytest.mark.asyncio
+    async def test_analyze_code_batch_splits_and_reorders(self):
+        """Test that prompts are sent batch_size at a time and mapped back by id."""
+        batch_sizes = []
+        max_tokens = {}
+
+        async def handler(request):
+            body = await request.json()
+            items = orjson.loads(body["messages"][-1]["content"])
+            batch_sizes.append(len(items))
+            max_tokens[len(items)] = body["max_tokens"]
+            assert body["response_format"] == {"type": "json_object"}
+            # Reply out of order, dropping the last item
+            answers = [{"id": item["id"], "analysis": f"ok:{item['code']}"} for item in items[:-1]]
+            content = orjson.dumps({"analyses": list(reversed(answers))}).decode()
+            return web.json_response({"choices": [{"message": {"content": content}}]})
+
+        server = await _start_fake_openai(handler)
+        env = {
+            "OPENAI_API_KEY": "sk-test",
+            "OPENAI_BASE_URL": str(server.make_url("/v1")),
+            "OPENAI_MODEL": "gpt-4o",
+            "OPENAI_MAX_TOKENS": "1000",
+            "OPENAI_BATCH_MAX_TOKENS": "6000"
+        }
+        try:
+            with patch.dict("os.environ", env):
+                client = OpenAIClient()
+            prompts = [f"p{i}" for i in range(10)]
+            results = await client.analyze_code_batch(prompts, batch_size=8)
+            await client.aclose()
+        finally:
+            await server.close()
+
+        assert sorted(batch_sizes) == [2, 8]
+        assert max_tokens == {2: 2000, 8: 6000}
+        assert [r["analysis"] for r in results[:7]] == [f"ok:p{i}" for i in range(7)]
+        assert results[7]["success"] is False
+        assert results[8]["analysis"] == "ok:p8"
+        assert results[9]["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_analyze_code_batch_with_default_model(self):
+        """Test that the default gpt-4 settings produce a request gpt-4 accepts."""
+        bodies = []
+
+        async def handler(request):
+            body = await request.json()
+            bodies.append(body)
+            # Reject what the real API rejects for plain gpt-4
+            if "response_format" in body or body["max_tokens"] > 4096:
+                return web.json_response({"error": {"message": "invalid request"}}, status=400)
+            items = orjson.loads(body["messages"][-1]["content"])
+            answers = [{"id": item["id"], "analysis": f"ok:{item['code']}"} for item in items]
+            content = "Here you go:\n```json\n" + orjson.dumps(answers).decode() + "\n```"
+            return web.json_response({"choices": [{"message": {"content": content}}]})
+
+        server = await _start_fake_openai(handler)
+        env = {"OPENAI_API_KEY": "sk-test", "OPENAI_BASE_URL": str(server.make_url("/v1"))}
+        try:
+            with patch.dict("os.environ", env):
+                for key in ("OPENAI_MODEL", "OPENAI_MAX_TOKENS", "OPENAI_BATCH_MAX_TOKENS"):
+                    os.environ.pop(key, None)
+                client = OpenAIClient()
+            results = await client.analyze_code_batch([f"p{i}" for i in range(8)])
+            await client.aclose()
+        finally:
+            await server.close()
+
+        assert bodies[0]["model"] == "gpt-4"
+        assert bodies[0]["max_tokens"] == 4096
+        assert [r["analysis"] for r in results] == [f"ok:p{i}" for i in range(8)]
+
+    @pytest.mark.asyncio
+    async def test_batch_api_round_trip(self):
+        """Test submitting to and collecting from the Batch API."""
+        uploaded = {}
+
+        async def upload_file(request):
+            form = await request.post()
+            uploaded["lines"] = form["file"].file.read().splitlines()
+            return web.json_response({"id": "file-in"})
+
+        async def create_batch(request):
+            return web.json_response({"id": "batch-1", "status": "validating"})
+
+        async def get_batch(request):
+            return web.json_response({"id": "batch-1", "status": "completed", "output_file_id": "file-out"})
+
+        async def file_content(request):
+            lines = [
+                {"custom_id": str(i), "response": {"body": {"choices": [{"message": {"content": f"a{i}"}}]}}}
+                for i in (1, 0)
+            ]
+            return web.Response(body=b"\n".join(orjson.dumps(line) for line in lines))
+
+        app = web.Application()
+        app.router.add_post("/v1/files", upload_file)
+        app.router.add_post("/v1/batches", create_batch)
+        app.router.add_get("/v1/batches/batch-1", get_batch)
+        app.router.add_get("/v1/files/file-out/content", file_content)
+        server = TestServer(app)
+        await server.start_server()
+        env = {"OPENAI_API_KEY": "sk-test", "OPENAI_BASE_URL": str(server.make_url("/v1"))}
+        try:
+            with patch.dict("os.environ", env):
+                client = OpenAIClient()
+            batch = await client.submit_analysis_batch(["x", "y"])
+            results = await client.wait_for_analysis_batch(batch["id"], poll_interval=0)
+            await client.aclose()
+        finally:
+            await server.close()
+
+        assert len(uploaded["lines"]) == 2
+        assert orjson.loads(uploaded["lines"][0])["body"]["messages"][-1]["content"] == "x"
+        assert [r["analysis"] for r in results] == ["a0", "a1"]
+
+    @pytest.mark.asyncio
+    async def test_batch_results_keep_prompt_order_when_requests_fail(self):
+        """Test that failed and missing requests get fallbacks instead of shifting later results."""
+        batches = {
+            "partial": {"status": "completed", "output_file_id": "file-out", "error_file_id": "file-err",
+                        "request_counts": {"total": 4, "completed": 2, "failed": 1}},
+            "all-failed": {"status": "completed", "output_file_id": None, "error_file_id": "file-err",
+                           "request_counts": {"total": 2, "completed": 0, "failed": 2}},
+        }
+        fetched = []
+
+        async def get_batch(request):
+            return web.json_response({"id": request.match_info["batch_id"], **batches[request.match_info["batch_id"]]})
+
+        async def file_content(request):
+            file_id = request.match_info["file_id"]
+            fetched.append(file_id)
+            if file_id == "file-out":
+                lines = [
+                    {"custom_id": str(i), "response": {"body": {"choices": [{"message": {"content": f"a{i}"}}]}}}
+                    for i in (2, 0)
+                ]
+            else:
+                lines = [{"custom_id": "1", "response": None, "error": {"message": "bad request"}}]
+            return web.Response(body=b"\n".join(orjson.dumps(line) for line in lines))
+
+        app = web.Application()
+        app.router.add_get("/v1/batches/{batch_id}", get_batch)
+        app.router.add_get("/v1/files/{file_id}/content", file_content)
+        server = TestServer(app)
+        await server.start_server()
+        env = {"OPENAI_API_KEY": "sk-test", "OPENAI_BASE_URL": str(server.make_url("/v1"))}
+        try:
+            with patch.dict("os.environ", env):
+                client = OpenAIClient()
+            partial = await client.get_analysis_batch_results("partial")
+            all_failed = await client.get_analysis_batch_results("all-failed")
+            await client.aclose()
+        finally:
+            await server.close()
+
+        assert [r["success"] for r in partial] == [True, False, True, False]
+        assert (partial[0]["analysis"], partial[2]["analysis"]) == ("a0", "a2")
+        assert "bad request" in partial[1]["error"]
+        assert [r["success"] for r in all_failed] == [False, False]
+        assert "None" not in fetched
@@ -0,0 +1,41 @@
+"""
+Tests for client-side LLM rate limiting.
+"""
+
+import time
+import pytest
+
+from server.services.llm.rate_limit import TokenBucket, create_bucket, parse_retry_after
+
+
+class TestTokenBucket:
+    """Test request pacing."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill(self):
+        """Test that acquiring beyond the burst waits for the refill rate."""
+        bucket = TokenBucket(rate=20.0, capacity=1.0)
+
+        start = time.monotonic()
+        await bucket.acquire()
+        await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_consumed_debt_blocks_until_repaid(self):
+        """Test that usage charged after a response delays the next request."""
+        bucket = TokenBucket(rate=100.0, capacity=10.0)
+        bucket.consume(15)
+
+        start = time.monotonic()
+        await bucket.acquire(0)
+
+        assert time.monotonic() - start >= 0.04
+
+    def test_unlimited_and_retry_after(self):
+        """Test disabled limits and Retry-After parsing."""
+        assert create_bucket(0) is None
+        assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+        assert parse_retry_after({"Retry-After": "2"}) == 2.0
+        assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
@@ -0,0 +1,84 @@
+"""
+Tests for the file-backed vector store.
+"""
+
+import json
+import os
+import numpy as np
+import pytest
+
+from server.services.indexer.vector_store import VectorStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "vector_store.json"
+    path.write_text(json.dumps({
+        "embeddings": [[1.0], [2.0], [3.0]],
+        "metadata": [{"id": code_id, "code": code_id, "metadata": {}} for code_id in ("a", "b", "c")]
+    }))
+    store = VectorStore()
+    store.store_file = str(path)
+    return store
+
+
+class TestVectorStoreIndex:
+    """Test ID lookups through the position index."""
+
+    @pytest.mark.asyncio
+    async def test_lookup_by_id(self, store):
+        """Test that loaded entries can be fetched by ID."""
+        await store.load_store()
+
+        assert (await store.get_code_by_id("b"))["code"] == "b"
+        assert await store.get_code_by_id("missing") is None
+
+    def test_code_ids_are_stable(self, store):
+        """Test that IDs are 128-bit hex digests of code plus metadata."""
+        code_id = store.generate_code_id("x = 1", {"language": "python"})
+
+        assert len(code_id) == 32
+        assert code_id == store.generate_code_id("x = 1", {"language": "python"})
+        assert code_id != store.generate_code_id("x = 1")
+
+    @pytest.mark.asyncio
+    async def test_delete_keeps_index_consistent(self, store):
+        """Test that positions after a deleted entry still resolve correctly."""
+        await store.load_store()
+
+        assert await store.delete_code("a") is True
+        assert await store.delete_code("a") is False
+        assert (await store.get_code_by_id("c"))["code"] == "c"
+        assert store.embeddings[store._positions["c"]] == [3.0]
+
+
+class TestVectorStorePersistence:
+    """Test write-behind persistence."""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_deferred_until_flush(self, store):
+        """Test that deletes only mark the store dirty and flush rewrites the file."""
+        await store.load_store()
+
+        await store.delete_code("b")
+        on_disk = json.loads(open(store.store_file).read())
+        assert len(on_disk["metadata"]) == 3
+        assert store._dirty is True
+
+        await store.close()
+        on_disk = json.loads(open(store.store_file).read())
+        assert [m["id"] for m in on_disk["metadata"]] == ["a", "c"]
+        assert store._dirty is False
+
+    @pytest.mark.asyncio
+    async def test_numpy_embeddings_round_trip(self, store):
+        """Test that numpy embeddings are written as plain lists and reload."""
+        await store.load_store()
+        store.embeddings[0] = np.array([0.5, 0.25])
+
+        await store.save_store()
+        assert not os.path.exists(store.store_file + ".tmp")
+        await store.load_store()
+
+        assert store.embeddings[0] == [0.5, 0.25]
+        assert (await store.get_code_by_id("c"))["code"] == "c"